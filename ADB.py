@@ -5,6 +5,14 @@ import subprocess
 import time
 import sys
 import re
+import queue
+import uuid
+import atexit
+import threading
+import hashlib
+import shutil
+import zlib
+import json
 from colorama import Fore, Style, init
 
 # Initialize colorama
@@ -33,8 +41,41 @@ DEVICE_IPS = [
     # Add more IPs as needed
 ]
 
+# Persistent shell sessions
+SHELL_SENTINEL = "__BCA_SHELL_DONE__"
+SHELL_TIMEOUT = 60  # seconds to wait for a pooled shell command
+FEATURES_TIMEOUT = 10  # seconds to wait for `adb features`
+SHELL_COMMAND_PATTERN = re.compile(r'^adb\s+(?:-s\s+(\S+)\s+)?shell\s+(\S.*)$')
+HOST_SHELL_CHARS = set('|&;<>()$`\'"\\*?')  # Commands using these need the host shell
+
+# Differential database pulls
+EXEC_OUT_TIMEOUT = 120  # seconds to wait for an exec-out transfer
+DIFF_PAGE_SIZE = 4096  # SQLite page size assumed when the local header can't be read
+DIFF_PAGES_PER_BLOCK = 64  # SQLite pages hashed together in the first pass; only changed blocks are hashed page by page
+DIFF_MAX_CHANGED_RATIO = 0.5  # Above this share of changed blocks a full pull is cheaper
+DIFF_RUNS_PER_CALL = 100  # Block runs fetched per exec-out, keeps the command line short
+
+# Compressed database streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_TIMEOUT = 300  # seconds a whole streamed transfer may take before the adb process is killed
+STREAM_COMPRESS_LEVEL = 6  # gzip level for pushes; the device uses gzip's default for pulls
+
+# Which root and copy methods work on each device
+CAPABILITY_CACHE_FILE = os.path.join(DB_DIR, "device_capabilities.json")
+
+_adb_path = None
+_shell_sessions = {}
+_shell_sessions_lock = threading.Lock()
+_capabilities = None
+_capabilities_lock = threading.Lock()
+_device_fingerprints = {}
+
 def get_adb_path():
     """Get the path to the ADB executable in platform-tools."""
+    global _adb_path
+    if _adb_path:
+        return _adb_path
+    
     if os.name == 'nt':  # Windows
         adb_path = os.path.join(PLATFORM_TOOLS_DIR, "adb.exe")
     else:  # Linux/Mac
@@ -44,6 +85,7 @@ def get_adb_path():
         log_message(f"ADB executable not found at {adb_path}", "ERROR")
         sys.exit(1)
     
+    _adb_path = adb_path
     return adb_path
 
 def ensure_directories_exist():
@@ -74,10 +116,221 @@ def log_message(message, level="INFO"):
     with open(LOG_FILE, 'a') as log_file:
         log_file.write(formatted_message + "\n")
 
+class ShellCommandInterrupted(Exception):
+    """A pooled shell command was sent but its result was lost, so it may already have run."""
+
+def has_shell_v2(device=None):
+    """Check whether adb and the device support shell_v2, which keeps stderr separate."""
+    command = [get_adb_path()]
+    if device:
+        command += ["-s", device]
+    command.append("features")
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=FEATURES_TIMEOUT)
+        return result.returncode == 0 and "shell_v2" in result.stdout
+    except Exception as e:
+        log_message(f"Could not read adb features: {str(e)}", "WARNING")
+        return False
+
+class AdbShellSession:
+    """
+    A long-lived `adb shell` process for one device.
+    
+    Commands are written to the shell's stdin one at a time and their output is
+    read back up to a unique sentinel, so many commands share one connection.
+    Without shell_v2 the device's stderr arrives on stdout, so only stdout is framed.
+    """
+    
+    def __init__(self, device=None):
+        self.device = device
+        self.process = None
+        self.lock = threading.Lock()
+        self.shell_v2 = None
+        self._stdout_lines = None
+        self._stderr_lines = None
+    
+    def _start(self):
+        """Start the adb shell process and its output reader threads."""
+        if self.shell_v2 is None:
+            self.shell_v2 = has_shell_v2(self.device)
+        
+        command = [get_adb_path()]
+        if self.device:
+            command += ["-s", self.device]
+        command.append("shell")
+        
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1
+        )
+        self._stdout_lines = queue.Queue()
+        self._stderr_lines = queue.Queue()
+        for stream, lines in ((self.process.stdout, self._stdout_lines),
+                              (self.process.stderr, self._stderr_lines)):
+            threading.Thread(target=self._read_stream, args=(stream, lines), daemon=True).start()
+        
+        if not self.shell_v2:
+            # Legacy shells run on a pty: turn off input echo and drop everything up to a first sentinel
+            marker = f"{SHELL_SENTINEL}{uuid.uuid4().hex}"
+            self.process.stdin.write(f"stty -echo 2>/dev/null; echo {marker}\n")
+            self.process.stdin.flush()
+            self._read_until(self._stdout_lines, marker, time.time() + SHELL_TIMEOUT)
+        log_message(f"Opened adb shell session for {self.device or 'default device'}"
+                    f"{'' if self.shell_v2 else ' (legacy shell)'}", "INFO")
+    
+    @staticmethod
+    def _read_stream(stream, lines):
+        """Copy lines from a pipe into a queue until EOF."""
+        try:
+            for line in iter(stream.readline, ''):
+                lines.put(line)
+        except Exception:
+            pass
+        lines.put(None)
+    
+    @staticmethod
+    def _read_until(lines, marker, deadline):
+        """Collect queued lines until the marker line; returns (output, marker line remainder)."""
+        collected = []
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for adb shell output")
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("Timed out waiting for adb shell output")
+            if line is None:
+                raise ConnectionError("adb shell session closed")
+            line = line.replace("\r", "")  # Legacy pty shells end lines with \r\n
+            if line.startswith(marker):
+                return "".join(collected), line[len(marker):].strip()
+            collected.append(line)
+    
+    def is_alive(self):
+        """Check whether the shell process is still running."""
+        return self.process is not None and self.process.poll() is None
+    
+    def run(self, command, timeout=SHELL_TIMEOUT):
+        """
+        Run a command in the session.
+        
+        Returns:
+            Tuple of (return code, stdout, stderr)
+        
+        Raises ConnectionError if the command could not be sent (safe to retry)
+        and ShellCommandInterrupted if it was sent but its result was lost.
+        """
+        with self.lock:
+            try:
+                if not self.is_alive():
+                    self._start()
+                
+                marker = f"{SHELL_SENTINEL}{uuid.uuid4().hex}"
+                # stdin is detached so a command can never swallow the sentinel lines
+                framing = f"{command} </dev/null\nprintf '\\n%s:%d\\n' {marker} $?\n"
+                if self.shell_v2:
+                    framing += f"echo {marker} >&2\n"
+                self.process.stdin.write(framing)
+                self.process.stdin.flush()
+            except Exception as e:
+                self.close()
+                raise ConnectionError(f"Could not send command to adb shell: {str(e)}") from e
+            
+            try:
+                deadline = time.time() + timeout
+                stdout, status = self._read_until(self._stdout_lines, marker, deadline)
+                stderr = self._read_until(self._stderr_lines, marker, deadline)[0] if self.shell_v2 else ""
+            except Exception as e:
+                self.close()
+                raise ShellCommandInterrupted(str(e)) from e
+            
+            # Drop the newline printed ahead of the sentinel
+            if stdout.endswith("\n"):
+                stdout = stdout[:-1]
+            returncode = int(status.lstrip(":") or 1)
+            if not self.shell_v2 and returncode != 0:
+                stderr = stdout  # Errors were mixed into stdout
+            return returncode, stdout, stderr
+    
+    def close(self):
+        """Terminate the shell process."""
+        if self.process is None:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.write("exit\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=2)
+        except Exception:
+            self.process.kill()
+        finally:
+            self.process = None
+
+def get_shell_session(device=None):
+    """Get the pooled shell session for a device, creating it on first use."""
+    key = device or ""
+    with _shell_sessions_lock:
+        session = _shell_sessions.get(key)
+        if session is None:
+            session = AdbShellSession(device)
+            _shell_sessions[key] = session
+        return session
+
+def run_shell_command(device, command, timeout=SHELL_TIMEOUT):
+    """
+    Run a device shell command over the pooled session for the device.
+    
+    Returns:
+        Tuple of (return code, stdout, stderr)
+    """
+    session = get_shell_session(device)
+    try:
+        return session.run(command, timeout)
+    except ConnectionError:
+        # The command never reached the device (replugged, adb server restarted); reconnect once
+        log_message(f"adb shell session for {device or 'default device'} lost, reconnecting", "WARNING")
+        return session.run(command, timeout)
+
+def close_shell_sessions():
+    """Close all pooled shell sessions."""
+    with _shell_sessions_lock:
+        for session in _shell_sessions.values():
+            session.close()
+        _shell_sessions.clear()
+
+atexit.register(close_shell_sessions)
+
+def parse_shell_command(command):
+    """
+    Split an `adb [-s serial] shell ...` command into (device, shell command).
+    
+    Returns None for commands that are not plain shell commands or that rely on
+    the host shell (pipes, redirects, quoting), so they keep running as before.
+    """
+    if not isinstance(command, str):
+        if any(" " in part for part in command):
+            return None
+        command = " ".join(command)
+    
+    match = SHELL_COMMAND_PATTERN.match(command.strip())
+    if not match or HOST_SHELL_CHARS.intersection(command):
+        return None
+    return match.group(1), match.group(2)
+
 def run_adb_command(command, check_output=True, shell=False):
     """
     Run an ADB command and return the output or status.
     
+    Plain `adb shell` commands go through the pooled shell session for the
+    device; everything else runs as a one-off adb process.
+    
     Args:
         command: The command to run (list or string)
         check_output: Whether to capture and return output
@@ -86,6 +339,23 @@ def run_adb_command(command, check_output=True, shell=False):
     Returns:
         Output of the command or True/False if check_output is False
     """
+    shell_command = parse_shell_command(command)
+    if shell_command:
+        device, device_command = shell_command
+        log_message(f"Running ADB command: {command}", "INFO")
+        try:
+            returncode, stdout, stderr = run_shell_command(device, device_command)
+            if returncode != 0:
+                log_message(f"Command failed with error: {stderr}", "ERROR")
+                return "" if check_output else False
+            return stdout.strip() if check_output else True
+        except ShellCommandInterrupted as e:
+            # The command may already have run, so running it again could repeat a tap or copy
+            log_message(f"Shell command interrupted, not retrying: {str(e)}", "ERROR")
+            return "" if check_output else False
+        except Exception as e:
+            log_message(f"Shell session error, retrying as a one-off command: {str(e)}", "WARNING")
+    
     try:
         adb_path = get_adb_path()
         
@@ -454,6 +724,80 @@ def confirm_action(action):
     confirmation = input(f"\n{Fore.YELLOW}Are you sure you want to {action} the app? (y/n): {Style.RESET_ALL}").lower()
     return confirmation == 'y' or confirmation == 'yes'
 
+def get_device_fingerprint(device=None):
+    """Get the device's build fingerprint, cached for the life of the process."""
+    key = device or ""
+    if key not in _device_fingerprints:
+        adb_prefix = f"adb -s {device} " if device else "adb "
+        _device_fingerprints[key] = run_adb_command(f"{adb_prefix}shell getprop ro.build.fingerprint", shell=True) or "unknown"
+    return _device_fingerprints[key]
+
+def get_capability_key(device=None):
+    """Key capabilities by serial and build fingerprint so an OS update re-probes."""
+    return f"{device or 'default'}|{get_device_fingerprint(device)}"
+
+def load_capabilities():
+    """Load the per-device capability cache from disk."""
+    global _capabilities
+    if _capabilities is None:
+        _capabilities = {}
+        try:
+            if os.path.exists(CAPABILITY_CACHE_FILE):
+                with open(CAPABILITY_CACHE_FILE, 'r') as f:
+                    _capabilities = json.load(f)
+        except Exception as e:
+            log_message(f"Error loading device capability cache: {str(e)}", "WARNING")
+    return _capabilities
+
+def set_capability(device, name, value):
+    """Remember (or with value None, forget) a working method for a device."""
+    key = get_capability_key(device)
+    with _capabilities_lock:
+        capabilities = load_capabilities().setdefault(key, {})
+        if value is None:
+            capabilities.pop(name, None)
+        else:
+            capabilities[name] = value
+        try:
+            os.makedirs(DB_DIR, exist_ok=True)
+            with open(CAPABILITY_CACHE_FILE, 'w') as f:
+                json.dump(_capabilities, f, indent=4)
+        except Exception as e:
+            log_message(f"Error saving device capability cache: {str(e)}", "WARNING")
+
+def get_capability(device, name):
+    """Get the cached working method for a device, or None."""
+    key = get_capability_key(device)
+    with _capabilities_lock:
+        return load_capabilities().get(key, {}).get(name)
+
+def try_methods(device, name, methods, attempt):
+    """
+    Try methods in order until `attempt(method)` succeeds, starting with the one
+    cached for this device. The winner is cached; a failing cached method is
+    forgotten and the rest are probed again.
+    
+    Returns the method that worked, or None.
+    """
+    cached = get_capability(device, name)
+    if cached in methods:
+        methods = [cached] + [method for method in methods if method != cached]
+    
+    for method in methods:
+        try:
+            if attempt(method):
+                if method != cached:
+                    set_capability(device, name, method)
+                return method
+        except Exception:
+            pass
+        if method == cached:
+            log_message(f"Cached {name} method stopped working, re-probing", "WARNING")
+    
+    if cached:
+        set_capability(device, name, None)
+    return None
+
 def test_root_access(device=None):
     """
     Test root access with multiple methods.
@@ -473,14 +817,14 @@ def test_root_access(device=None):
         f"{adb_prefix}shell su -c echo root"
     ]
     
-    for test in root_tests:
-        try:
-            result = run_adb_command(test, shell=True)
-            if "root" in result.lower() or "uid=0" in result.lower():
-                log_message(f"Root access verified with command: {test}", "SUCCESS")
-                return True
-        except:
-            continue
+    def is_root(test):
+        result = run_adb_command(test, shell=True).lower()
+        return "root" in result or "uid=0" in result
+    
+    test = try_methods(device, "root_test", root_tests, is_root)
+    if test:
+        log_message(f"Root access verified with command: {test}", "SUCCESS")
+        return True
     
     log_message("All root access tests failed", "ERROR")
     return False
@@ -514,14 +858,8 @@ def test_database_access(device=None):
         f"{adb_prefix}shell su -c ls {device_db_path}"
     ]
     
-    file_exists = False
-    for cmd in root_ls_commands:
-        try:
-            if run_adb_command(cmd, shell=True):
-                file_exists = True
-                break
-        except:
-            continue
+    file_exists = try_methods(device, "root_ls", root_ls_commands,
+                              lambda cmd: run_adb_command(cmd, shell=True))
     
     if not file_exists:
         log_message("Database file not found", "ERROR")
@@ -534,14 +872,13 @@ def test_database_access(device=None):
         f"{adb_prefix}shell su -c ls -l {device_db_path}"
     ]
     
-    for cmd in perms_commands:
-        try:
-            perms = run_adb_command(cmd, shell=True)
-            if perms:
-                log_message(f"File permissions: {perms}", "INFO")
-                break
-        except:
-            continue
+    def show_perms(cmd):
+        perms = run_adb_command(cmd, shell=True)
+        if perms:
+            log_message(f"File permissions: {perms}", "INFO")
+        return perms
+    
+    try_methods(device, "root_perms", perms_commands, show_perms)
     
     # Test file size with root - using su 0 which works
     log_message("Testing file size...", "INFO")
@@ -551,14 +888,13 @@ def test_database_access(device=None):
         f"{adb_prefix}shell su -c stat -c%s {device_db_path}"
     ]
     
-    for cmd in size_commands:
-        try:
-            size = run_adb_command(cmd, shell=True)
-            if size:
-                log_message(f"File size: {size} bytes", "INFO")
-                break
-        except:
-            continue
+    def show_size(cmd):
+        size = run_adb_command(cmd, shell=True)
+        if size:
+            log_message(f"File size: {size} bytes", "INFO")
+        return size
+    
+    try_methods(device, "root_size", size_commands, show_size)
     
     # Test direct file transfer
     log_message("Testing direct file transfer...", "INFO")
@@ -584,6 +920,319 @@ def test_database_access(device=None):
         log_message(f"Direct file transfer test failed: {str(e)}", "ERROR")
         return False
 
+def get_exec_command(device, mode, command):
+    """Build an `adb exec-out` / `adb exec-in` argument list for a device command."""
+    args = [get_adb_path()]
+    if device:
+        args += ["-s", device]
+    return args + [mode, command]
+
+def run_exec_out(device, command, timeout=EXEC_OUT_TIMEOUT):
+    """
+    Run a device command over `adb exec-out` and return its raw stdout bytes.
+    
+    Unlike `adb shell`, exec-out doesn't allocate a pty, so binary output comes
+    back unmodified. Returns None if the command fails.
+    """
+    log_message(f"Running ADB command: exec-out {command[:120]}", "INFO")
+    try:
+        result = subprocess.run(get_exec_command(device, "exec-out", command), capture_output=True, timeout=timeout)
+    except Exception as e:
+        log_message(f"exec-out command error: {str(e)}", "ERROR")
+        return None
+    if result.returncode != 0:
+        log_message(f"exec-out command failed with error: {result.stderr.decode(errors='replace')}", "ERROR")
+        return None
+    return result.stdout
+
+def get_db_page_size(path):
+    """Read the page size from a local SQLite file's header, defaulting to DIFF_PAGE_SIZE."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(100)
+        if header.startswith(b"SQLite format 3\x00"):
+            page_size = int.from_bytes(header[16:18], 'big')
+            return 65536 if page_size == 1 else page_size
+    except OSError:
+        pass
+    return DIFF_PAGE_SIZE
+
+def get_local_block_hashes(path, block_size):
+    """MD5 of each fixed-size block of a local file."""
+    hashes = []
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hashes.append(hashlib.md5(block).hexdigest())
+    return hashes
+
+def get_remote_block_hashes(device, device_path, block_size):
+    """
+    MD5 of each fixed-size block of a file on the device, computed on-device as root.
+    
+    Returns (file size, list of block hashes), or None if they can't be read.
+    """
+    script = (
+        f"f={device_path}; s=$(stat -c %s $f) || exit 1; echo $s; "
+        f"n=$(( (s + {block_size} - 1) / {block_size} )); i=0; "
+        f"while [ $i -lt $n ]; do dd if=$f bs={block_size} skip=$i count=1 2>/dev/null | md5sum; i=$((i+1)); done"
+    )
+    output = run_exec_out(device, f"su 0 sh -c '{script}'")
+    if not output:
+        return None
+    
+    lines = output.decode(errors='replace').split()
+    try:
+        size = int(lines[0])
+    except (IndexError, ValueError):
+        return None
+    # md5sum prints "<hash>  -", keep just the hashes
+    hashes = [token for token in lines[1:] if len(token) == 32]
+    if len(hashes) != (size + block_size - 1) // block_size:
+        log_message("Device block checksum listing was incomplete", "WARNING")
+        return None
+    return size, hashes
+
+def get_remote_page_hashes(device, device_path, page_size, runs):
+    """
+    MD5 of each page in the given (first page, count) runs of a file on the device.
+    
+    Returns a dict of page number to hash, or None if they can't be read.
+    """
+    hashes = {}
+    for start in range(0, len(runs), DIFF_RUNS_PER_CALL):
+        batch = runs[start:start + DIFF_RUNS_PER_CALL]
+        script = "; ".join(
+            f"i={first}; while [ $i -lt {first + count} ]; do "
+            f"dd if={device_path} bs={page_size} skip=$i count=1 2>/dev/null | md5sum; i=$((i+1)); done"
+            for first, count in batch
+        )
+        output = run_exec_out(device, f"su 0 sh -c '{script}'")
+        if not output:
+            return None
+        
+        page_hashes = [token for token in output.decode(errors='replace').split() if len(token) == 32]
+        pages = [page for first, count in batch for page in range(first, first + count)]
+        if len(page_hashes) != len(pages):
+            log_message("Device page checksum listing was incomplete", "WARNING")
+            return None
+        hashes.update(zip(pages, page_hashes))
+    return hashes
+
+def get_block_runs(blocks):
+    """Group sorted block numbers into (first block, count) runs."""
+    runs = []
+    for block in blocks:
+        if runs and runs[-1][0] + runs[-1][1] == block:
+            runs[-1][1] += 1
+        else:
+            runs.append([block, 1])
+    return runs
+
+def pull_sql_db_differential(device=None):
+    """
+    Update the local database copy by pulling only the pages that changed on the device.
+    
+    Pages are first compared in blocks of DIFF_PAGES_PER_BLOCK, then page by page
+    inside the blocks that differ. The patch is applied to a copy that only
+    replaces the local database once it matches the device. Returns True if the
+    local copy now matches the device, False if a full pull is needed.
+    """
+    if not os.path.exists(DB_PATH):
+        return False
+    
+    device_db_path = f"/data/data/{APP_PACKAGE}/cache/cache/data/sql.db"
+    temp_path = DB_PATH + ".part"
+    page_size = get_db_page_size(DB_PATH)
+    block_size = page_size * DIFF_PAGES_PER_BLOCK
+    
+    log_message("Comparing database blocks with the device...", "INFO")
+    remote = get_remote_block_hashes(device, device_db_path, block_size)
+    if not remote:
+        return False
+    remote_size, remote_hashes = remote
+    local_hashes = get_local_block_hashes(DB_PATH, block_size)
+    
+    changed_blocks = [i for i, block_hash in enumerate(remote_hashes)
+                      if i >= len(local_hashes) or local_hashes[i] != block_hash]
+    if len(changed_blocks) > len(remote_hashes) * DIFF_MAX_CHANGED_RATIO:
+        log_message(f"{len(changed_blocks)} of {len(remote_hashes)} blocks changed, using a full pull", "INFO")
+        return False
+    
+    # Narrow each changed block down to the pages that actually differ
+    page_count = (remote_size + page_size - 1) // page_size
+    block_runs = [[first * DIFF_PAGES_PER_BLOCK,
+                   min(count * DIFF_PAGES_PER_BLOCK, page_count - first * DIFF_PAGES_PER_BLOCK)]
+                  for first, count in get_block_runs(changed_blocks)]
+    remote_pages = get_remote_page_hashes(device, device_db_path, page_size, block_runs)
+    if remote_pages is None:
+        return False
+    local_pages = get_local_block_hashes(DB_PATH, page_size)
+    changed = [page for page, page_hash in sorted(remote_pages.items())
+               if page >= len(local_pages) or local_pages[page] != page_hash]
+    
+    # Fetch the changed runs of pages, several dd calls per exec-out
+    patches = []
+    runs = get_block_runs(changed)
+    for start in range(0, len(runs), DIFF_RUNS_PER_CALL):
+        batch = runs[start:start + DIFF_RUNS_PER_CALL]
+        script = "; ".join(
+            f"dd if={device_db_path} bs={page_size} skip={first} count={count} 2>/dev/null"
+            for first, count in batch
+        )
+        data = run_exec_out(device, f"su 0 sh -c '{script}'")
+        if data is None:
+            return False
+        offset = 0
+        for first, count in batch:
+            length = min(count * page_size, remote_size - first * page_size)
+            if offset + length > len(data):
+                log_message("Device returned fewer bytes than expected", "WARNING")
+                return False
+            patches.append((first * page_size, data[offset:offset + length]))
+            offset += length
+    
+    try:
+        # Patch a copy so a failed or stale patch never touches the local database
+        shutil.copyfile(DB_PATH, temp_path)
+        with open(temp_path, 'r+b') as f:
+            for position, chunk in patches:
+                f.seek(position)
+                f.write(chunk)
+            f.truncate(remote_size)
+        
+        # Pages can change while we read them; fall back to a full pull if anything disagrees
+        if get_local_block_hashes(temp_path, block_size) != remote_hashes:
+            log_message("Patched database doesn't match the device, using a full pull", "WARNING")
+            return False
+        
+        os.replace(temp_path, DB_PATH)
+    except OSError as e:
+        log_message(f"Error patching database copy: {str(e)}", "WARNING")
+        return False
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    transferred = sum(len(chunk) for _, chunk in patches)
+    log_message(f"Database updated from device: {len(changed)} of {page_count} pages changed "
+                f"({transferred} bytes transferred)", "SUCCESS")
+    return True
+
+def start_stream_watchdog(process):
+    """Kill a streaming adb process if it is still running after STREAM_TIMEOUT, unblocking its reader or writer."""
+    watchdog = threading.Timer(STREAM_TIMEOUT, process.kill)
+    watchdog.daemon = True
+    watchdog.start()
+    return watchdog
+
+def stop_stream_process(process, watchdog):
+    """Cancel a stream's watchdog and make sure its adb process is gone."""
+    if watchdog:
+        watchdog.cancel()
+    if process and process.poll() is None:
+        process.kill()
+        process.wait()
+
+def pull_sql_db_compressed(device=None):
+    """
+    Pull the database by streaming `cat | gzip` over adb exec-out into a local decompressor.
+    
+    Skips the /sdcard staging copy. Returns False if the device can't stream it.
+    """
+    device_db_path = f"/data/data/{APP_PACKAGE}/cache/cache/data/sql.db"
+    temp_path = DB_PATH + ".part"
+    command = get_exec_command(device, "exec-out", f"su 0 sh -c 'cat {device_db_path} | gzip -c'")
+    
+    log_message("Attempting compressed streaming pull...", "INFO")
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    wire_bytes = 0
+    process = None
+    watchdog = None
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        watchdog = start_stream_watchdog(process)
+        with open(temp_path, 'wb') as out:
+            for chunk in iter(lambda: process.stdout.read(STREAM_CHUNK_SIZE), b''):
+                wire_bytes += len(chunk)
+                out.write(decompressor.decompress(chunk))
+            out.write(decompressor.flush())
+        process.wait(timeout=EXEC_OUT_TIMEOUT)
+        
+        if process.returncode != 0 or not decompressor.eof:
+            log_message("Compressed stream was incomplete", "WARNING")
+            return False
+        with open(temp_path, 'rb') as f:
+            if not f.read(16).startswith(b"SQLite format 3\x00"):
+                log_message("Compressed stream did not contain a SQLite database", "WARNING")
+                return False
+        
+        os.replace(temp_path, DB_PATH)
+        file_size = os.path.getsize(DB_PATH)
+        log_message(f"Database successfully pulled to {DB_PATH}", "SUCCESS")
+        log_message(f"File size: {file_size} bytes ({wire_bytes} bytes over the wire)", "INFO")
+        return True
+    except Exception as e:
+        log_message(f"Compressed pull failed: {str(e)}", "WARNING")
+        return False
+    finally:
+        stop_stream_process(process, watchdog)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def push_sql_db_compressed(device=None):
+    """
+    Push the database by streaming it gzipped over adb exec-in straight into the app directory.
+    
+    The upload lands in a temporary file next to the database and only replaces it
+    once its checksum matches, so a failed stream never leaves the app with a broken file.
+    """
+    device_db_path = f"/data/data/{APP_PACKAGE}/cache/cache/data/sql.db"
+    device_temp_path = f"{device_db_path}.part"
+    command = get_exec_command(device, "exec-in", f"su 0 sh -c 'gzip -d > {device_temp_path}'")
+    
+    log_message("Attempting compressed streaming push...", "INFO")
+    compressor = zlib.compressobj(STREAM_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    local_md5 = hashlib.md5()
+    wire_bytes = 0
+    process = None
+    watchdog = None
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        watchdog = start_stream_watchdog(process)
+        with open(DB_PATH, 'rb') as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                local_md5.update(chunk)
+                data = compressor.compress(chunk)
+                wire_bytes += len(data)
+                process.stdin.write(data)
+        data = compressor.flush()
+        wire_bytes += len(data)
+        process.stdin.write(data)
+        process.stdin.close()
+        process.wait(timeout=EXEC_OUT_TIMEOUT)
+        if process.returncode != 0:
+            log_message("Compressed push stream failed", "WARNING")
+            return False
+    except Exception as e:
+        log_message(f"Compressed push failed: {str(e)}", "WARNING")
+        return False
+    finally:
+        stop_stream_process(process, watchdog)
+    
+    # Only replace the live database once the upload checks out
+    remote_md5 = run_exec_out(device, f"su 0 md5sum {device_temp_path}")
+    if not remote_md5 or remote_md5.decode(errors='replace').split()[0] != local_md5.hexdigest():
+        log_message("Pushed database checksum mismatch", "WARNING")
+        run_exec_out(device, f"su 0 rm -f {device_temp_path}")
+        return False
+    
+    # cp onto the existing file keeps the app as its owner
+    if run_exec_out(device, f"su 0 sh -c 'cp {device_temp_path} {device_db_path} && chmod 600 {device_db_path} && rm {device_temp_path}'") is None:
+        return False
+    
+    log_message(f"Database successfully pushed using compressed stream ({wire_bytes} bytes over the wire)", "SUCCESS")
+    return True
+
 def handle_sql_db(action="pull", device=None):
     """
     Handle SQL database file operations with improved root access methods and error handling.
@@ -613,6 +1262,14 @@ def handle_sql_db(action="pull", device=None):
         log_message("Pulling SQL database from device...", "INFO")
         log_message(f"Target path: {DB_PATH}", "INFO")
         
+        # With a local copy already here, only move the pages that changed
+        if pull_sql_db_differential(device):
+            return True
+        
+        # Stream it gzipped straight from the app directory, skipping /sdcard
+        if pull_sql_db_compressed(device):
+            return True
+        
         # Try different root methods, prioritizing su 0 which works
         root_methods = [
             f"{adb_prefix}shell su 0 cp {device_db_path} {sdcard_path}",  # Try su 0 first
@@ -623,12 +1280,11 @@ def handle_sql_db(action="pull", device=None):
             f"{adb_prefix}shell su -c cat {device_db_path} > {sdcard_path}"
         ]
         
-        success = False
-        for method in root_methods:
+        def try_copy(method):
             log_message(f"Trying root method: {method}", "INFO")
-            if run_adb_command(method, check_output=False, shell=True):
-                success = True
-                break
+            return run_adb_command(method, check_output=False, shell=True)
+        
+        success = try_methods(device, "root_copy", root_methods, try_copy)
         
         if not success:
             log_message("All root methods failed. Trying alternative approach...", "WARNING")
@@ -679,6 +1335,12 @@ def handle_sql_db(action="pull", device=None):
         run_adb_command(stop_cmd, check_output=False, shell=True)
         time.sleep(2)  # Give it time to stop
         
+        # Stream it gzipped straight into the app directory, skipping /sdcard
+        if push_sql_db_compressed(device):
+            log_message("Restarting BCA Track app...", "INFO")
+            start_app(device)
+            return True
+        
         # Try direct push method first
         log_message("Attempting direct push method...", "INFO")
         try:
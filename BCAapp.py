@@ -18,12 +18,15 @@ import logging
 import asyncio
 import subprocess
 import configparser
+import struct
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
 import cv2
@@ -53,7 +56,7 @@ import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 # Local imports
-from ADB import run_adb_command, check_adb_devices
+from ADB import run_adb_command, run_shell_command, check_adb_devices
 
 # Initialize rich console
 console = Console()
@@ -87,12 +90,50 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 class AppMode(Enum):
-    """Application modes for different update rates."""
+    """Application modes for different update rates (longest idle interval)."""
     FAST = 30  # 30 seconds
     NORMAL = 60  # 1 minute
     SLOW = 300  # 5 minutes
     EXTRA_SLOW = 600  # 10 minutes
 
+class CaptureMethod(Enum):
+    """Screenshot capture backends."""
+    EXEC_OUT = "exec-out"  # Raw framebuffer streamed over a single adb pipe
+    FILE_BASED = "file"  # screencap -p to /sdcard, pull, then read the PNG
+
+# Raw screencap pixel formats: format id -> (bytes per pixel, conversion to BGR)
+RAW_SCREENCAP_FORMATS = {
+    1: (4, cv2.COLOR_RGBA2BGR),  # RGBA_8888
+    2: (4, cv2.COLOR_RGBA2BGR),  # RGBX_8888
+    3: (3, cv2.COLOR_RGB2BGR),  # RGB_888
+    5: (4, cv2.COLOR_BGRA2BGR),  # BGRA_8888
+}
+
+# Adaptive capture scheduling
+SCHEDULER_MIN_INTERVAL = 2  # Seconds between captures right after a match or macro
+SCHEDULER_BACKOFF = 2.0  # Interval multiplier for each idle capture, up to the AppMode value
+MACRO_COOLDOWN = AppMode.FAST.value  # Seconds before the same match may run its macro or speed up captures again
+
+# Template matching workers (0 = match sequentially on the capture thread)
+DEFAULT_MATCH_WORKERS = min(4, os.cpu_count() or 1)
+ROI_PADDING = 40  # Pixels added around a learned search region
+ROI_MIN_HITS = 2  # Matches at a spot before it joins the search region, so one false positive can't widen it
+ROI_MAX_BOXES = 8  # Match spots remembered per macro
+ROI_BOX_TOLERANCE = 4  # Pixels two match spots may differ by and still count as the same spot
+
+# Total threads for all devices: one capture thread per device, the rest match templates
+WORKER_BUDGET = max(2, os.cpu_count() or 2)
+
+# Coarse-to-fine pyramid matching
+PYRAMID_SCALE = 0.5  # Coarse level size relative to the full frame
+PYRAMID_MARGIN = 0.15  # Coarse scores may fall this far below the threshold and still be refined
+PYRAMID_CANDIDATES = 3  # Coarse peaks refined at full resolution per template
+PYRAMID_MIN_TEMPLATE = 16  # Templates smaller than this (px) at the coarse level match at full size
+
+# Frame-change detection
+FRAME_SIGNATURE_SIZE = (54, 120)  # Thumbnail (width, height) compared between frames
+FRAME_CHANGE_THRESHOLD = 12  # Largest thumbnail pixel difference still treated as noise
+
 @dataclass
 class User:
     """User data structure."""
@@ -110,15 +151,323 @@ class Macro:
     is_active: bool = True
     users: Optional[List[Dict]] = None
     confidence_threshold: float = 0.8  # Default threshold if not specified
+    search_boxes: Optional[Dict[str, List[Dict]]] = None  # Learned {x, y, width, height, hits} per resolution
+
+@dataclass
+class MatchTask:
+    """One template to match against a frame."""
+    image_file: str
+    template: np.ndarray
+    region: Optional[Tuple[int, int, int, int]] = None  # Padded (x, y, width, height) to search first
+    threshold: float = 0.8
+    coarse_template: Optional[np.ndarray] = None  # Template at PYRAMID_SCALE for pyramid matching
+
+@dataclass
+class Frame:
+    """A captured screenshot; the BGR array is canonical and other views are derived from it once."""
+    image: np.ndarray  # BGR, as returned by the capture methods
+    timestamp: float
+    _gray: Optional[np.ndarray] = field(default=None, repr=False)
+    
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale frame for matching, computed on first use."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+    
+    def to_qimage(self) -> QImage:
+        """Build a QImage for the preview; it owns its pixels so it cannot outlive the array."""
+        height, width = self.image.shape[:2]
+        return QImage(self.image.data, width, height, self.image.strides[0],
+                      QImage.Format.Format_BGR888).copy()
+
+def match_pyramid(gray_screenshot: np.ndarray, coarse_screenshot: np.ndarray, task: MatchTask,
+                  scale: float = PYRAMID_SCALE) -> Tuple[float, tuple]:
+    """Find candidates on the coarse frame and refine them at full resolution; returns (max_val, max_loc)."""
+    coarse_result = cv2.matchTemplate(coarse_screenshot, task.coarse_template, cv2.TM_CCOEFF_NORMED)
+    coarse_height, coarse_width = task.coarse_template.shape[:2]
+    template_height, template_width = task.template.shape[:2]
+    frame_height, frame_width = gray_screenshot.shape[:2]
+    padding = int(round(2 / scale)) + 2
+    
+    # The best coarse peak is always refined, so the reported score is a full-resolution one
+    best_val, best_loc = -1.0, (0, 0)
+    for candidate in range(PYRAMID_CANDIDATES):
+        min_val, coarse_val, min_loc, coarse_loc = cv2.minMaxLoc(coarse_result)
+        if candidate > 0 and coarse_val < task.threshold - PYRAMID_MARGIN:
+            break
+        
+        # Suppress this peak so the next iteration finds a different candidate
+        cx, cy = coarse_loc
+        coarse_result[max(0, cy - coarse_height // 2):cy + coarse_height // 2 + 1,
+                      max(0, cx - coarse_width // 2):cx + coarse_width // 2 + 1] = -1.0
+        
+        x0 = max(0, int(cx / scale) - padding)
+        y0 = max(0, int(cy / scale) - padding)
+        x1 = min(frame_width, int(cx / scale) + template_width + padding)
+        y1 = min(frame_height, int(cy / scale) + template_height + padding)
+        window = gray_screenshot[y0:y1, x0:x1]
+        if window.shape[0] < template_height or window.shape[1] < template_width:
+            continue
+        
+        result = cv2.matchTemplate(window, task.template, cv2.TM_CCOEFF_NORMED)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if max_val > best_val:
+            best_val, best_loc = max_val, (max_loc[0] + x0, max_loc[1] + y0)
+        if max_val >= task.threshold:
+            break
+    
+    return best_val, best_loc
+
+def match_templates(gray_screenshot: np.ndarray, tasks: List[MatchTask],
+                    coarse_screenshot: Optional[np.ndarray] = None) -> List[Tuple]:
+    """Match templates against a grayscale frame; returns (image, max_val, max_loc) per task."""
+    results = []
+    for task in tasks:
+        try:
+            # Search the learned region first, falling back to the full frame on a miss
+            if task.region is not None:
+                x, y, width, height = task.region
+                roi = gray_screenshot[y:y + height, x:x + width]
+                if roi.shape[0] >= task.template.shape[0] and roi.shape[1] >= task.template.shape[1]:
+                    result = cv2.matchTemplate(roi, task.template, cv2.TM_CCOEFF_NORMED)
+                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                    if max_val >= task.threshold:
+                        results.append((task.image_file, max_val, (max_loc[0] + x, max_loc[1] + y)))
+                        continue
+            
+            if coarse_screenshot is not None and task.coarse_template is not None:
+                max_val, max_loc = match_pyramid(gray_screenshot, coarse_screenshot, task)
+                results.append((task.image_file, max_val, max_loc))
+                continue
+            
+            result = cv2.matchTemplate(gray_screenshot, task.template, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            results.append((task.image_file, max_val, max_loc))
+        except Exception as e:
+            # Returned rather than logged so the caller reports it once, in task order
+            results.append((task.image_file, None, str(e)))
+    return results
+
+class MatchPool:
+    """
+    Fans the templates of one frame out across a thread pool.
+    cv2.matchTemplate releases the GIL, so threads scale across cores without
+    pickling the frame to worker processes, which on Windows would also each
+    re-import this whole GUI module.
+    """
+    
+    def __init__(self, workers: int = DEFAULT_MATCH_WORKERS):
+        self.workers = workers
+        self.executor = None
+        self.lock = threading.Lock()
+    
+    def configure(self, workers: int):
+        """Change the worker count; the pool is rebuilt on next use."""
+        with self.lock:
+            self._shutdown_executor()
+            self.workers = max(0, int(workers))
+            logger.info(f"Template matching: {self.workers} thread workers")
+    
+    def _get_executor(self):
+        """Create the executor on first use."""
+        if self.executor is None and self.workers > 0:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="match")
+        return self.executor
+    
+    def match_all(self, gray_screenshot: np.ndarray, tasks: List[MatchTask],
+                  coarse_screenshot: Optional[np.ndarray] = None) -> List[Tuple[str, float, tuple]]:
+        """Match every task against the frame, returning results in task order."""
+        # The lock only guards the executor so several devices can share the pool
+        with self.lock:
+            executor = self._get_executor() if len(tasks) > 1 else None
+        
+        try:
+            if executor is None:
+                results = match_templates(gray_screenshot, tasks, coarse_screenshot)
+            else:
+                futures = [executor.submit(match_templates, gray_screenshot, [task], coarse_screenshot)
+                           for task in tasks]
+                results = [entry for future in futures for entry in future.result()]
+        except RuntimeError:
+            # Pool was reconfigured mid-frame; finish this frame on the calling thread
+            results = match_templates(gray_screenshot, tasks, coarse_screenshot)
+        
+        matches = []
+        for image_file, max_val, max_loc in results:
+            if max_val is None:
+                logger.error(f"Error processing image {image_file}: {max_loc}")
+                continue
+            matches.append((image_file, max_val, max_loc))
+        return matches
+    
+    def _shutdown_executor(self):
+        """Shut down the current executor, if any."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+    
+    def shutdown(self):
+        """Stop the worker pool."""
+        with self.lock:
+            self._shutdown_executor()
+
+class AdaptiveScheduler:
+    """Capture interval that tightens after activity and backs off exponentially while idle."""
+    
+    def __init__(self, max_interval: float = AppMode.FAST.value,
+                 min_interval: float = SCHEDULER_MIN_INTERVAL, backoff: float = SCHEDULER_BACKOFF):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.condition = threading.Condition()
+        self._woken = False
+    
+    def record_activity(self):
+        """A match or macro just happened; the screen is likely to change soon."""
+        with self.condition:
+            self.interval = self.min_interval
+        self.wake()
+    
+    def record_idle(self):
+        """Nothing happened on the last capture; back off."""
+        with self.condition:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+    
+    def set_max_interval(self, max_interval: float):
+        """Set the longest idle interval."""
+        with self.condition:
+            self.max_interval = max(max_interval, self.min_interval)
+            self.interval = min(self.interval, self.max_interval)
+        self.wake()
+    
+    def wake(self):
+        """Interrupt a pending wait."""
+        with self.condition:
+            self._woken = True
+            self.condition.notify_all()
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait until the timeout or a wake-up; returns True if woken."""
+        with self.condition:
+            if not self._woken:
+                self.condition.wait(timeout)
+            woken = self._woken
+            self._woken = False
+            return woken
+
+class TemplateWatcher(FileSystemEventHandler):
+    """Marks the template cache stale when the images directory changes."""
+    
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+    
+    def on_any_event(self, event):
+        self.cache.invalidate()
+
+class TemplateCache:
+    """Grayscale trigger images kept in memory, keyed by file and mtime."""
+    
+    def __init__(self, images_dir=IMAGES_DIR):
+        self.images_dir = Path(images_dir)
+        self.templates: Dict[str, Tuple[float, np.ndarray]] = {}  # image file -> (mtime, gray)
+        self.scaled: Dict[Tuple[str, float], Optional[np.ndarray]] = {}  # (image file, scale) -> gray
+        self.lock = threading.Lock()
+        self.observer = None
+        self.version = 0  # Bumped whenever the set of templates changes
+        self._stale = True
+    
+    def start_watching(self):
+        """Start watching the images directory for changes."""
+        try:
+            self.observer = Observer()
+            self.observer.schedule(TemplateWatcher(self), str(self.images_dir), recursive=False)
+            self.observer.daemon = True
+            self.observer.start()
+            logger.info(f"Watching {self.images_dir} for template changes")
+        except Exception as e:
+            # Without a watcher the directory is re-checked (by mtime) on every frame
+            logger.warning(f"Template watcher unavailable: {e}")
+            self.observer = None
+    
+    def stop_watching(self):
+        """Stop the directory watcher."""
+        try:
+            if self.observer:
+                self.observer.stop()
+                self.observer.join(timeout=2)
+                self.observer = None
+        except Exception as e:
+            logger.error(f"Error stopping template watcher: {e}")
+    
+    def invalidate(self):
+        """Force a rescan of the images directory on next use."""
+        self._stale = True
+    
+    def _refresh(self):
+        """Reload new or modified templates and drop deleted ones."""
+        templates = {}
+        for path in sorted(self.images_dir.glob("*.png")):
+            try:
+                mtime = path.stat().st_mtime
+                cached = self.templates.get(path.name)
+                if cached and cached[0] == mtime:
+                    templates[path.name] = cached
+                    continue
+                
+                # New or modified: drop any downscaled copies of the old version
+                self.scaled = {key: value for key, value in self.scaled.items() if key[0] != path.name}
+                template = cv2.imread(str(path))
+                if template is None:
+                    logger.warning(f"Could not read template: {path.name}")
+                    continue
+                gray = np.ascontiguousarray(cv2.cvtColor(template, cv2.COLOR_BGR2GRAY))
+                templates[path.name] = (mtime, gray)
+                logger.debug(f"Loaded template: {path.name}")
+            except Exception as e:
+                logger.error(f"Error loading template {path.name}: {e}")
+        if {name: entry[0] for name, entry in templates.items()} != {name: entry[0] for name, entry in self.templates.items()}:
+            self.version += 1
+        self.templates = templates
+        self.scaled = {key: value for key, value in self.scaled.items() if key[0] in templates}
+    
+    def get_templates(self) -> List[Tuple[str, np.ndarray]]:
+        """Get (image file, grayscale template) pairs in file name order."""
+        with self.lock:
+            if self._stale or self.observer is None:
+                self._stale = False
+                self._refresh()
+            return [(image_file, gray) for image_file, (_, gray) in self.templates.items()]
+    
+    def get_scaled(self, image_file: str, scale: float) -> Optional[np.ndarray]:
+        """Get a template downscaled for pyramid matching, or None if it would be too small."""
+        with self.lock:
+            key = (image_file, scale)
+            if key not in self.scaled:
+                cached = self.templates.get(image_file)
+                if cached is None:
+                    return None
+                gray = cached[1]
+                height, width = gray.shape[:2]
+                if min(height, width) * scale < PYRAMID_MIN_TEMPLATE:
+                    self.scaled[key] = None
+                else:
+                    resized = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                    self.scaled[key] = np.ascontiguousarray(resized)
+            return self.scaled[key]
 
 class ScreenCapture(QThread):
     """Thread for capturing screenshots"""
-    screenshot_ready = pyqtSignal(QImage)
+    screenshot_ready = pyqtSignal(object)  # Frame
     error_occurred = pyqtSignal(str)
     match_found = pyqtSignal(str, float, tuple)  # macro_name, confidence, position
+    match_seen = pyqtSignal(str, float, tuple)  # Replayed or cooling-down match; display only, runs no macro
     no_match = pyqtSignal()
     
-    def __init__(self, device_id, refresh_rate=30):  # Default to 30 seconds
+    def __init__(self, device_id, refresh_rate=SCHEDULER_MIN_INTERVAL, template_cache=None, match_pool=None):
         QThread.__init__(self)
         self.device_id = device_id
         self.refresh_rate = refresh_rate
@@ -133,11 +482,30 @@ class ScreenCapture(QThread):
         self.current_screenshot = None
         self.current_screenshot_time = 0
         self.macro_manager = None  # Initialize macro_manager as None
+        self.capture_method = CaptureMethod.EXEC_OUT  # Fall back to file-based on failure
+        
+        # Grayscale templates, shared between captures when one is passed in
+        if template_cache is None:
+            template_cache = TemplateCache()
+            template_cache.start_watching()
+        self.template_cache = template_cache
+        self.match_pool = match_pool or MatchPool()
+        self.pyramid_matching = False  # Coarse-to-fine matching at PYRAMID_SCALE
+        
+        # Frame-change detection
+        self.last_frame_signature = None
+        self.last_frame_key = None
+        self.last_matches = []  # (image_file, max_val, max_loc) emitted for the last matched frame
+        self.last_fired = {}  # Macro name -> time its match last ran the macro
+        self.frames_checked = 0
+        self.frames_skipped = 0
         
         # Timing system
         self.timing_mode = AppMode.FAST  # Default to fast mode (30 seconds)
         self.last_check_time = time.time()  # Initialize to current time
         self.check_interval = 30  # Default 30 seconds
+        self.scheduler = AdaptiveScheduler(max_interval=self.timing_mode.value)
+        self.next_capture_time = 0
         self.processing_start_time = 0
         self.processing_end_time = 0
         
@@ -215,6 +583,20 @@ class ScreenCapture(QThread):
             logging.error(f"ADB command error: {e}")
             raise
     
+    def _run_shell_command(self, command):
+        """Run a device shell command over the pooled adb shell session."""
+        try:
+            returncode, stdout, stderr = run_shell_command(self.device_id, command)
+        except ConnectionError as e:
+            # Only raised before the command was sent; ShellCommandInterrupted means it may
+            # already have run, so it propagates rather than tapping or typing twice
+            logger.warning(f"Shell session unavailable ({e}), falling back to one-off adb call")
+            return self._run_adb_command(f"adb -s {self.device_id} shell {command}")
+        
+        if returncode != 0:
+            raise Exception(f"ADB command failed: {stderr.strip()}")
+        return stdout.strip()
+    
     def save_screenshot(self, filename: str) -> bool:
         """Save current screenshot to file."""
         try:
@@ -227,7 +609,8 @@ class ScreenCapture(QThread):
                 
             # Save to images directory
             save_path = IMAGES_DIR / filename
-            self.last_screenshot.save(str(save_path))
+            if not cv2.imwrite(str(save_path), self.last_screenshot.image):
+                raise Exception(f"OpenCV failed to write image: {save_path}")
             logging.info(f"Screenshot saved as {filename}")
             return True
             
@@ -235,6 +618,39 @@ class ScreenCapture(QThread):
             logging.error(f"Error saving screenshot: {e}")
             return False
             
+    def _method1_exec_out(self):
+        """Method 1: Stream the raw framebuffer over adb exec-out (fastest)"""
+        try:
+            result = subprocess.run(
+                [self.adb_path, "-s", self.device_id, "exec-out", "screencap"],
+                capture_output=True,
+                timeout=15
+            )
+            if result.returncode != 0:
+                raise Exception(f"screencap failed: {result.stderr.decode(errors='replace').strip()}")
+            
+            # Header is width, height, format (+ colorspace on Android 9+), little-endian uint32
+            data = result.stdout
+            if len(data) < 12:
+                raise Exception(f"Short screencap output ({len(data)} bytes)")
+            width, height, pixel_format = struct.unpack_from('<III', data, 0)
+            if pixel_format not in RAW_SCREENCAP_FORMATS:
+                raise Exception(f"Unsupported screencap pixel format: {pixel_format}")
+            
+            bytes_per_pixel, conversion = RAW_SCREENCAP_FORMATS[pixel_format]
+            payload_size = width * height * bytes_per_pixel
+            header_size = len(data) - payload_size
+            if header_size not in (12, 16):
+                raise Exception(f"Unexpected screencap size {len(data)} for {width}x{height}")
+            
+            pixels = np.frombuffer(data, dtype=np.uint8, count=payload_size, offset=header_size)
+            pixels = pixels.reshape((height, width, bytes_per_pixel))
+            return cv2.cvtColor(pixels, conversion)
+            
+        except Exception as e:
+            logger.error(f"Exec-out method failed: {e}")
+            return None
+    
     def _method2_file_based(self):
         """Method 2: File-based (most reliable)"""
         try:
@@ -249,13 +665,13 @@ class ScreenCapture(QThread):
             
             # Clean up any existing files first
             try:
-                self._run_adb_command(f"adb -s {self.device_id} shell rm {device_file}", check_output=False)
+                self._run_shell_command(f"rm -f {device_file}")
             except Exception:
                 pass
             
             # Capture to device
             logger.debug(f"Capturing screenshot to device: {device_file}")
-            self._run_adb_command(f"adb -s {self.device_id} shell screencap -p {device_file}", check_output=False)
+            self._run_shell_command(f"screencap -p {device_file}")
             time.sleep(0.5)  # Wait for file to be written
             
             # Pull from device
@@ -273,7 +689,7 @@ class ScreenCapture(QThread):
             
             # Clean up
             try:
-                self._run_adb_command(f"adb -s {self.device_id} shell rm {device_file}", check_output=False)
+                self._run_shell_command(f"rm -f {device_file}")
                 if tmp_file.exists():
                     tmp_file.unlink()
             except Exception:
@@ -292,24 +708,25 @@ class ScreenCapture(QThread):
             if current_time - self.last_screenshot_time < self.refresh_rate:
                 return self.last_screenshot
             
-            # Try file-based method first (most reliable)
-            img = self._method2_file_based()
+            img = None
+            if self.capture_method == CaptureMethod.EXEC_OUT:
+                img = self._method1_exec_out()
+                if img is None:
+                    logger.warning("Exec-out capture failed, falling back to file-based method")
+            
+            if img is None:
+                img = self._method2_file_based()
             if img is None:
                 raise Exception("Failed to capture screenshot")
             
-            # Convert to RGB
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            
-            # Convert to QImage
-            height, width, channel = img.shape
-            bytes_per_line = 3 * width
-            q_img = QImage(img.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+            # The BGR array is the frame; the preview builds its own QImage when shown
+            frame = Frame(image=img, timestamp=current_time)
             
             # Store last screenshot
-            self.last_screenshot = q_img
+            self.last_screenshot = frame
             self.last_screenshot_time = current_time
             
-            return q_img
+            return frame
             
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -347,18 +764,39 @@ class ScreenCapture(QThread):
         try:
             with self.lock:
                 self.timing_mode = mode
-                self.check_interval = mode.value
+                self.scheduler.set_max_interval(mode.value)
+                self.check_interval = self.scheduler.interval
                 self.last_check_time = time.time()  # Reset the last check time
                 logger.info(f"Timing mode changed to: {mode.name}")
-                logger.info(f"Check interval set to: {self.check_interval} seconds")
+                logger.info(f"Idle check interval capped at: {mode.value} seconds")
         except Exception as e:
             logger.error(f"Error setting timing mode: {e}")
             self.error_occurred.emit(f"Error setting timing mode: {e}")
     
+    def set_capture_method(self, method: CaptureMethod):
+        """Set the backend used to capture screenshots."""
+        try:
+            with self.lock:
+                self.capture_method = method
+                logger.info(f"Capture method changed to: {method.name}")
+        except Exception as e:
+            logger.error(f"Error setting capture method: {e}")
+            self.error_occurred.emit(f"Error setting capture method: {e}")
+    
+    def set_pyramid_matching(self, enabled: bool):
+        """Enable or disable coarse-to-fine pyramid matching."""
+        try:
+            with self.lock:
+                self.pyramid_matching = enabled
+                logger.info(f"Pyramid matching {'enabled' if enabled else 'disabled'}")
+        except Exception as e:
+            logger.error(f"Error setting pyramid matching: {e}")
+            self.error_occurred.emit(f"Error setting pyramid matching: {e}")
+    
     def process_screenshot(self, macro_manager=None):
         """Process current screenshot with image matching."""
         try:
-            if not self.current_screenshot or self.is_processing:
+            if self.current_screenshot is None or self.is_processing:
                 return
                 
             # Use provided macro_manager or fall back to instance variable
@@ -369,36 +807,53 @@ class ScreenCapture(QThread):
                 
             start_time = time.time()
             
-            # Convert QImage to numpy array for OpenCV
-            width = self.current_screenshot.width()
-            height = self.current_screenshot.height()
-            ptr = self.current_screenshot.bits()
-            ptr.setsize(height * width * 3)  # RGB format
-            arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 3))
-            
-            # Convert RGB to BGR for OpenCV
-            screenshot = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-            
-            # Process each image file
-            for image_file in os.listdir(IMAGES_DIR):
-                if not image_file.endswith('.png'):
-                    continue
-                    
+            # Grayscale once per frame; every template matches against this
+            gray_screenshot = self.current_screenshot.gray
+            
+            # Skip matching when the screen hasn't changed since the last matched frame
+            if self._frame_unchanged(gray_screenshot):
+                self.frames_skipped += 1
+                logger.info(f"Screen unchanged, reusing {len(self.last_matches)} previous match(es)")
+                fired = False
+                for image_file, max_val, max_loc in self.last_matches:
+                    # A tap that missed leaves the screen as it was, so retry once the cooldown is over
+                    if self._cooldown_over(Path(image_file).stem):
+                        fired = True
+                        self.match_found.emit(image_file, max_val, max_loc)
+                    else:
+                        self.match_seen.emit(image_file, max_val, max_loc)
+                if not self.last_matches:
+                    self.no_match.emit()
+                return fired
+            
+            # Match all cached templates, results come back in template order
+            tasks = []
+            coarse_screenshot = None
+            if self.pyramid_matching:
+                coarse_screenshot = cv2.resize(gray_screenshot, None, fx=PYRAMID_SCALE, fy=PYRAMID_SCALE,
+                                               interpolation=cv2.INTER_AREA)
+            
+            thresholds = {}
+            for image_file, gray_template in self.template_cache.get_templates():
+                macro = manager.macros.get(Path(image_file).stem)
+                # One threshold decides both the ROI/pyramid search and acceptance
+                threshold = macro.get('confidence_threshold', manager.match_threshold) if macro else manager.match_threshold
+                thresholds[image_file] = threshold
+                tasks.append(MatchTask(
+                    image_file=image_file,
+                    template=gray_template,
+                    region=self._search_region(manager, Path(image_file).stem, gray_screenshot.shape),
+                    threshold=threshold,
+                    coarse_template=(self.template_cache.get_scaled(image_file, PYRAMID_SCALE)
+                                     if self.pyramid_matching else None)
+                ))
+            template_sizes = {task.image_file: task.template.shape for task in tasks}
+            
+            matches = self.match_pool.match_all(gray_screenshot, tasks, coarse_screenshot)
+            self.last_matches = []
+            fired = False
+            for image_file, max_val, max_loc in matches:
                 try:
-                    template_path = os.path.join(IMAGES_DIR, image_file)
-                    template = cv2.imread(str(template_path))
-                    
-                    if template is None:
-                        continue
-                        
-                    # Convert template to grayscale
-                    gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-                    gray_screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-                    
-                    # Perform template matching
-                    result = cv2.matchTemplate(gray_screenshot, gray_template, cv2.TM_CCOEFF_NORMED)
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                    
                     # Get macro name without extension
                     macro_name = Path(image_file).stem
                     
@@ -409,7 +864,7 @@ class ScreenCapture(QThread):
                         macro = manager.macros[macro_name]
                         macro_active = macro.get('is_active', True)
                     
-                    if max_val >= manager.match_threshold:
+                    if max_val >= thresholds[image_file]:
                         logger.info(f"Match found: {image_file} (Confidence: {max_val:.3f})")
                         if macro_exists and macro_active:
                             logger.info(f"Executing macro: {macro_name}")
@@ -418,8 +873,19 @@ class ScreenCapture(QThread):
                         else:
                             logger.info(f"No macro configured for {image_file}")
                         
+                        if macro_exists:
+                            manager.update_search_region(macro_name, max_loc, template_sizes[image_file],
+                                                         gray_screenshot.shape)
+                        
+                        self.last_matches.append((image_file, max_val, max_loc))
                         try:
-                            self.match_found.emit(image_file, max_val, max_loc)
+                            # A screen that stays up after its macro ran must not fire it again every capture
+                            if self._cooldown_over(macro_name):
+                                fired = True
+                                self.match_found.emit(image_file, max_val, max_loc)
+                            else:
+                                logger.info(f"{macro_name} matched again within {MACRO_COOLDOWN}s, not firing")
+                                self.match_seen.emit(image_file, max_val, max_loc)
                         except Exception as e:
                             logger.error(f"Error emitting match signal: {e}")
                             continue
@@ -430,13 +896,14 @@ class ScreenCapture(QThread):
                     
             # Emit no match signal if no matches found
             try:
-                self.no_match.emit()
+                if not self.last_matches:
+                    self.no_match.emit()
             except Exception as e:
                 logger.error(f"Error emitting no match signal: {e}")
                 
             processing_time = time.time() - start_time
-            next_check = self.check_interval - processing_time
-            logger.info(f"Next check in {next_check:.1f} seconds")
+            logger.info(f"Matching took {processing_time:.2f} seconds")
+            return fired
             
         except Exception as e:
             logger.error(f"Error processing screenshot: {e}")
@@ -445,35 +912,83 @@ class ScreenCapture(QThread):
             self.current_screenshot = None
             self.current_screenshot_time = None
 
+    def _cooldown_over(self, macro_name: str) -> bool:
+        """Claim a macro's match as new activity unless it already fired within MACRO_COOLDOWN."""
+        now = time.time()
+        if now - self.last_fired.get(macro_name, 0) < MACRO_COOLDOWN:
+            return False
+        self.last_fired[macro_name] = now
+        return True
+
+    def _frame_unchanged(self, gray_screenshot: np.ndarray) -> bool:
+        """Compare a thumbnail of the frame with the last matched frame's thumbnail."""
+        self.frames_checked += 1
+        signature = cv2.resize(gray_screenshot, FRAME_SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+        
+        # Template or mode changes make the previous results stale
+        key = (self.template_cache.version, self.pyramid_matching)
+        if self.last_frame_signature is not None and self.last_frame_key == key:
+            if int(cv2.absdiff(signature, self.last_frame_signature).max()) <= FRAME_CHANGE_THRESHOLD:
+                return True
+        
+        self.last_frame_signature = signature
+        self.last_frame_key = key
+        return False
+
+    def _search_region(self, manager, macro_name: str, frame_shape) -> Optional[Tuple[int, int, int, int]]:
+        """Get a macro's learned search region for this frame size, padded and clipped to the frame."""
+        boxes = [box for box in manager.get_search_boxes(macro_name, frame_shape) if box.get('hits', 0) >= ROI_MIN_HITS]
+        if not boxes:
+            return None
+        
+        # The region covers every confirmed match spot
+        frame_height, frame_width = frame_shape[:2]
+        x0 = max(0, min(box['x'] for box in boxes) - ROI_PADDING)
+        y0 = max(0, min(box['y'] for box in boxes) - ROI_PADDING)
+        x1 = min(frame_width, max(box['x'] + box['width'] for box in boxes) + ROI_PADDING)
+        y1 = min(frame_height, max(box['y'] + box['height'] for box in boxes) + ROI_PADDING)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
     def run(self):
         """Main thread loop."""
         while self.running:
             try:
+                # Wait for the next capture; activity, mode changes and stop() wake us early
+                wait_time = self.next_capture_time - time.time()
+                if wait_time > 0:
+                    if self.scheduler.wait(wait_time):
+                        self.next_capture_time = min(self.next_capture_time, time.time() + self.scheduler.interval)
+                    continue
+                
                 current_time = time.time()
+                matched = False
                 
-                # Only process if we're not already processing and enough time has passed
-                if (not self.is_processing_screenshot and 
-                    (not self.last_processing_time or 
-                     current_time - self.last_processing_time >= self.check_interval)):
+                # Take new screenshot
+                screenshot = self.capture_screenshot()
+                if screenshot is not None:
+                    self.is_processing_screenshot = True
+                    self.current_screenshot = screenshot
+                    self.current_screenshot_time = current_time
+                    self.screenshot_ready.emit(screenshot)
+                    logger.info(f"\nCapturing new screenshot at {datetime.now().strftime('%H:%M:%S')}")
                     
-                    # Take new screenshot
-                    screenshot = self.capture_screenshot()
-                    if screenshot:
-                        self.is_processing_screenshot = True
-                        self.current_screenshot = screenshot
-                        self.current_screenshot_time = current_time
-                        self.screenshot_ready.emit(screenshot)
-                        logger.info(f"\nCapturing new screenshot at {datetime.now().strftime('%H:%M:%S')}")
-                        
-                        # Process the new screenshot
-                        self.process_screenshot(self.macro_manager)
-                        
-                        # Update processing time
-                        self.last_processing_time = current_time
-                        self.is_processing_screenshot = False
-                        
-                # Sleep for a short time to prevent CPU overuse
-                time.sleep(0.1)
+                    # Process the new screenshot
+                    matched = self.process_screenshot(self.macro_manager)
+                    
+                    # Update processing time
+                    self.last_processing_time = current_time
+                    self.is_processing_screenshot = False
+                
+                # New matches pull the next capture in, idle frames push it out
+                if matched:
+                    self.scheduler.record_activity()
+                else:
+                    self.scheduler.record_idle()
+                self.check_interval = self.scheduler.interval
+                self.next_capture_time = current_time + self.check_interval
+                logger.info(f"Next check in {self.next_capture_time - time.time():.1f} seconds")
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
@@ -482,7 +997,16 @@ class ScreenCapture(QThread):
                 self.current_screenshot = None
                 self.current_screenshot_time = None
                 self.is_processing_screenshot = False
-                time.sleep(1)  # Wait before retrying
+                self.next_capture_time = time.time() + 1  # Wait before retrying
+    
+    def notify_activity(self):
+        """Tell the scheduler a macro ran so the next capture comes sooner."""
+        self.scheduler.record_activity()
+    
+    def stop(self):
+        """Stop the capture loop without waiting out the current interval."""
+        self.running = False
+        self.scheduler.wake()
 
     def set_macro_manager(self, macro_manager):
         """Set the macro manager instance."""
@@ -952,20 +1476,23 @@ class MacroManager:
         self.macros = {}
         self.screen_capture = screen_capture
         self.match_threshold = 0.8  # Default confidence threshold
+        # Capture threads learn search regions while the GUI edits macros
+        self.lock = threading.RLock()
         self._load_macros()
     
     def _load_macros(self):
         """Load all macros from the macros directory."""
         try:
-            self.macros.clear()
-            for file_path in self.macros_dir.glob("*.json"):
-                try:
-                    with open(file_path, 'r') as f:
-                        macro_data = json.load(f)
-                        macro_name = file_path.stem
-                        self.macros[macro_name] = macro_data
-                except Exception as e:
-                    logger.error(f"Error loading macro {file_path}: {e}")
+            with self.lock:
+                self.macros.clear()
+                for file_path in self.macros_dir.glob("*.json"):
+                    try:
+                        with open(file_path, 'r') as f:
+                            macro_data = json.load(f)
+                            macro_name = file_path.stem
+                            self.macros[macro_name] = macro_data
+                    except Exception as e:
+                        logger.error(f"Error loading macro {file_path}: {e}")
             
             logger.info(f"Loaded {len(self.macros)} macros")
             
@@ -977,12 +1504,16 @@ class MacroManager:
         try:
             macro_name = macro['name']
             file_path = self.macros_dir / f"{macro_name}.json"
+            temp_path = file_path.with_suffix(".json.tmp")
             
-            with open(file_path, 'w') as f:
-                json.dump(macro, f, indent=4)
-            
-            # Update in-memory macros
-            self.macros[macro_name] = macro
+            with self.lock:
+                # Write then rename so a reader never sees a half-written file
+                with open(temp_path, 'w') as f:
+                    json.dump(macro, f, indent=4)
+                os.replace(temp_path, file_path)
+                
+                # Update in-memory macros
+                self.macros[macro_name] = macro
             logger.info(f"Saved macro: {macro_name}")
             
         except Exception as e:
@@ -993,16 +1524,66 @@ class MacroManager:
         """Delete a macro file."""
         try:
             file_path = self.macros_dir / f"{macro_name}.json"
-            if file_path.exists():
-                file_path.unlink()
-                if macro_name in self.macros:
-                    del self.macros[macro_name]
-                logger.info(f"Deleted macro: {macro_name}")
+            with self.lock:
+                if file_path.exists():
+                    file_path.unlink()
+                    if macro_name in self.macros:
+                        del self.macros[macro_name]
+                    logger.info(f"Deleted macro: {macro_name}")
             
         except Exception as e:
             logger.error(f"Error deleting macro: {e}")
             raise
     
+    @staticmethod
+    def resolution_key(frame_shape) -> str:
+        """Key learned regions by frame size, so devices with different screens keep their own."""
+        height, width = frame_shape[:2]
+        return f"{width}x{height}"
+    
+    def get_search_boxes(self, macro_name: str, frame_shape) -> List[Dict]:
+        """Copy of a macro's learned match spots for this frame size."""
+        with self.lock:
+            macro = self.macros.get(macro_name)
+            boxes = macro.get('search_boxes') if macro else None
+            if not isinstance(boxes, dict):
+                return []
+            return [dict(box) for box in boxes.get(self.resolution_key(frame_shape), [])]
+    
+    def update_search_region(self, macro_name: str, position: tuple, template_size: tuple, frame_shape):
+        """Count a match at this spot; spots matched ROI_MIN_HITS times make up the search region."""
+        try:
+            with self.lock:
+                macro = self.macros.get(macro_name)
+                if not macro:
+                    return
+                
+                x, y = int(position[0]), int(position[1])
+                height, width = template_size[:2]
+                if not isinstance(macro.get('search_boxes'), dict):
+                    macro['search_boxes'] = {}
+                boxes = macro['search_boxes'].setdefault(self.resolution_key(frame_shape), [])
+                macro.pop('search_region', None)  # Regions learned before spots were counted
+                
+                box = next((b for b in boxes if abs(b['x'] - x) <= ROI_BOX_TOLERANCE
+                            and abs(b['y'] - y) <= ROI_BOX_TOLERANCE), None)
+                if box is None:
+                    if len(boxes) >= ROI_MAX_BOXES:
+                        # Forget the oldest unconfirmed spot first, then the oldest confirmed one
+                        unconfirmed = [b for b in boxes if b['hits'] < ROI_MIN_HITS]
+                        boxes.remove(unconfirmed[0] if unconfirmed else boxes[0])
+                    boxes.append({'x': x, 'y': y, 'width': int(width), 'height': int(height), 'hits': 1})
+                elif box['hits'] < ROI_MIN_HITS:
+                    box['hits'] += 1
+                    logger.info(f"Confirmed search spot for {macro_name} at ({x}, {y})")
+                else:
+                    return  # Already confirmed, nothing to save
+                
+                self.save_macro(macro)
+                
+        except Exception as e:
+            logger.error(f"Error updating search region for {macro_name}: {e}")
+    
     def execute_macro(self, macro_name: str, device_id: str = None):
         """Execute a macro's actions."""
         try:
@@ -1034,18 +1615,18 @@ class MacroManager:
                 
                 if action_type == 'tap':
                     x, y = action.get('x', 0), action.get('y', 0)
-                    self._run_adb_command(f"adb -s {device_id} shell input tap {x} {y}")
+                    self._run_shell_command(device_id, f"input tap {x} {y}")
                     
                 elif action_type == 'swipe':
                     x1, y1 = action.get('x1', 0), action.get('y1', 0)
                     x2, y2 = action.get('x2', 0), action.get('y2', 0)
                     duration = action.get('duration', 500)
-                    self._run_adb_command(f"adb -s {device_id} shell input swipe {x1} {y1} {x2} {y2} {duration}")
+                    self._run_shell_command(device_id, f"input swipe {x1} {y1} {x2} {y2} {duration}")
                     
                 elif action_type == 'key':
                     key = action.get('key')
                     if key:
-                        self._run_adb_command(f"adb -s {device_id} shell input keyevent {key}")
+                        self._run_shell_command(device_id, f"input keyevent {key}")
                         
                 elif action_type == 'text':
                     text = action.get('text')
@@ -1058,7 +1639,7 @@ class MacroManager:
                     if text:
                         # Escape single quotes in text
                         text = text.replace("'", "\\'")
-                        self._run_adb_command(f"adb -s {device_id} shell input text '{text}'")
+                        self._run_shell_command(device_id, f"input text '{text}'")
                         
                 elif action_type == 'wait':
                     seconds = action.get('seconds', 1)
@@ -1085,25 +1666,46 @@ class MacroManager:
         except Exception as e:
             logger.error(f"ADB command error: {e}")
             raise
+    
+    def _run_shell_command(self, device_id: str, command: str):
+        """Run a device shell command over the pooled adb shell session."""
+        try:
+            returncode, stdout, stderr = run_shell_command(device_id, command)
+        except ConnectionError as e:
+            # Only raised before the command was sent; ShellCommandInterrupted means it may
+            # already have run, so it propagates rather than tapping or typing twice
+            logger.warning(f"Shell session unavailable ({e}), falling back to one-off adb call")
+            prefix = f"adb -s {device_id} " if device_id else "adb "
+            return self._run_adb_command(f"{prefix}shell {command}")
+        
+        if returncode != 0:
+            logger.error(f"ADB command error: {stderr.strip()}")
+            raise Exception(f"ADB command failed: {stderr.strip()}")
+        return stdout.strip()
 
 class MainWindow(QMainWindow):
     """Main window of the application."""
     
-    def __init__(self, screen_capture, user_manager, macro_manager):
+    def __init__(self, screen_captures, user_manager, macro_manager):
         super().__init__()
-        self.screen_capture = screen_capture
+        if isinstance(screen_captures, ScreenCapture):
+            screen_captures = [screen_captures]
+        self.screen_captures = {capture.device_id: capture for capture in screen_captures}
+        self.screen_capture = screen_captures[0]  # Device shown in the selected preview tab
         self.user_manager = user_manager
         self.macro_manager = macro_manager
         self.current_macro = None
+        self.preview_labels = {}
+        self.preview_frames = {}  # Latest Frame per device, drawn when its tab is shown
         self.setup_ui()
         
-        # Connect signals
-        self.screen_capture.screenshot_ready.connect(self.update_preview)
-        self.screen_capture.match_found.connect(self.handle_match_found)
-        self.screen_capture.error_occurred.connect(self.handle_error)
-        
-        # Start screen capture
-        self.screen_capture.start()
+        # Connect signals and start one capture thread per device
+        for device_id, capture in self.screen_captures.items():
+            capture.screenshot_ready.connect(partial(self.update_preview, device_id=device_id))
+            capture.match_found.connect(partial(self.handle_match_found, device_id=device_id))
+            capture.match_seen.connect(partial(self.handle_match_found, device_id=device_id, execute=False))
+            capture.error_occurred.connect(self.handle_error)
+            capture.start()
         
         # Load macros
         self.update_macro_list()
@@ -1111,6 +1713,7 @@ class MainWindow(QMainWindow):
         # Set default values
         self.user_combo.setCurrentIndex(0)
         self.timing_combo.setCurrentText(AppMode.FAST.name)
+        self.capture_combo.setCurrentText(self.screen_capture.capture_method.name)
         self.device_combo.setCurrentText(self.screen_capture.device_id)
         self.confidence_threshold.setValue(0.8)
         
@@ -1134,6 +1737,7 @@ class MainWindow(QMainWindow):
         device_layout.addWidget(QLabel("Device:"))
         self.device_combo = QComboBox()
         self.device_combo.setMinimumWidth(200)
+        self.device_combo.currentTextChanged.connect(self.show_device_preview)
         device_layout.addWidget(self.device_combo)
         top_section.addLayout(device_layout)
         
@@ -1177,6 +1781,40 @@ class MainWindow(QMainWindow):
         # Add spacing
         top_section.addSpacing(20)
         
+        # Capture method selection
+        capture_layout = QHBoxLayout()
+        capture_layout.addWidget(QLabel("Capture:"))
+        self.capture_combo = QComboBox()
+        self.capture_combo.addItems([method.name for method in CaptureMethod])
+        self.capture_combo.currentTextChanged.connect(self.update_capture_method)
+        capture_layout.addWidget(self.capture_combo)
+        top_section.addLayout(capture_layout)
+        
+        # Add spacing
+        top_section.addSpacing(20)
+        
+        # Template matching workers (0 = sequential)
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Match Workers:"))
+        self.match_workers_spin = QSpinBox()
+        self.match_workers_spin.setRange(0, max(0, WORKER_BUDGET - len(self.screen_captures)))
+        self.match_workers_spin.setValue(self.screen_capture.match_pool.workers)
+        self.match_workers_spin.valueChanged.connect(self.update_match_workers)
+        workers_layout.addWidget(self.match_workers_spin)
+        top_section.addLayout(workers_layout)
+        
+        # Add spacing
+        top_section.addSpacing(20)
+        
+        # Coarse-to-fine pyramid matching
+        self.pyramid_toggle = QCheckBox("Pyramid Matching")
+        self.pyramid_toggle.setChecked(self.screen_capture.pyramid_matching)
+        self.pyramid_toggle.stateChanged.connect(self.toggle_pyramid_matching)
+        top_section.addWidget(self.pyramid_toggle)
+        
+        # Add spacing
+        top_section.addSpacing(20)
+        
         # Capture toggle checkbox
         self.capture_toggle = QCheckBox("Enable Capture")
         self.capture_toggle.setChecked(True)
@@ -1249,12 +1887,18 @@ class MainWindow(QMainWindow):
         preview_layout = QVBoxLayout()
         preview_layout.addWidget(QLabel("Preview"))
         
-        # Preview image
-        self.preview_label = QLabel()
-        self.preview_label.setMinimumSize(400, 300)
-        self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.preview_label.setStyleSheet("border: 1px solid #ccc;")
-        preview_layout.addWidget(self.preview_label)
+        # Preview image, one tab per device
+        self.preview_tabs = QTabWidget()
+        for device_id in self.screen_captures:
+            preview_label = QLabel()
+            preview_label.setMinimumSize(400, 300)
+            preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            preview_label.setStyleSheet("border: 1px solid #ccc;")
+            self.preview_labels[device_id] = preview_label
+            self.preview_tabs.addTab(preview_label, device_id)
+        self.preview_label = self.preview_labels[self.screen_capture.device_id]
+        self.preview_tabs.currentChanged.connect(self.select_device)
+        preview_layout.addWidget(self.preview_tabs)
         
         right_layout.addLayout(preview_layout)
         
@@ -1359,6 +2003,10 @@ class MainWindow(QMainWindow):
         self.countdown_label = QLabel()
         self.status_bar.addPermanentWidget(self.countdown_label)
         
+        # Add unchanged-frame skip ratio to status bar
+        self.skip_label = QLabel()
+        self.status_bar.addPermanentWidget(self.skip_label)
+        
         # Setup countdown timer
         self.countdown_timer = QTimer()
         self.countdown_timer.timeout.connect(self.update_countdown)
@@ -1479,31 +2127,50 @@ class MainWindow(QMainWindow):
             logger.error(f"Error editing user: {e}")
             self.status_bar.showMessage(f"Error: {e}")
 
-    def update_preview(self, image: QImage):
-        """Update the preview label with the latest screenshot."""
+    def update_preview(self, frame: Frame, device_id: str = None):
+        """Keep a device's latest frame and show it if its preview tab is visible."""
         try:
+            device_id = device_id or self.screen_capture.device_id
+            self.preview_frames[device_id] = frame
+            if device_id == self.screen_capture.device_id:
+                self.render_preview(device_id)
+        except Exception as e:
+            logger.error(f"Error updating preview: {e}")
+
+    def render_preview(self, device_id: str):
+        """Draw a device's latest frame into its preview label."""
+        try:
+            frame = self.preview_frames.get(device_id)
+            if frame is None:
+                return
+            preview_label = self.preview_labels[device_id]
+            
             # Scale image to fit preview label while maintaining aspect ratio
-            scaled_pixmap = QPixmap.fromImage(image).scaled(
-                self.preview_label.size(),
+            scaled_pixmap = QPixmap.fromImage(frame.to_qimage()).scaled(
+                preview_label.size(),
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            self.preview_label.setPixmap(scaled_pixmap)
+            preview_label.setPixmap(scaled_pixmap)
         except Exception as e:
-            logger.error(f"Error updating preview: {e}")
+            logger.error(f"Error rendering preview: {e}")
 
-    def handle_match_found(self, image_name: str, confidence: float, position: tuple):
-        """Handle when a match is found."""
+    def handle_match_found(self, image_name: str, confidence: float, position: tuple, device_id: str = None,
+                           execute: bool = True):
+        """Handle when a match is found on a device; replayed matches are only displayed."""
         try:
+            capture = self.screen_captures.get(device_id, self.screen_capture)
+            
             # Update match display
-            match_text = f"Match found: {image_name}\nConfidence: {confidence:.3f}\nPosition: {position}"
+            match_text = f"Match found: {image_name}\nDevice: {capture.device_id}\nConfidence: {confidence:.3f}\nPosition: {position}"
             self.match_display.setText(match_text)
             
             # Check if auto-execute is enabled
-            if self.auto_execute.isChecked():
+            if execute and self.auto_execute.isChecked():
                 macro_name = Path(image_name).stem
                 if macro_name in self.macro_manager.macros:
-                    self.macro_manager.execute_macro(macro_name, self.screen_capture.device_id)
+                    self.macro_manager.execute_macro(macro_name, capture.device_id)
+                    capture.notify_activity()
                     
         except Exception as e:
             logger.error(f"Error handling match: {e}")
@@ -1520,17 +2187,30 @@ class MainWindow(QMainWindow):
         """Toggle screen capture on/off."""
         try:
             if state == Qt.CheckState.Checked.value:
-                self.screen_capture.running = True
+                for capture in self.screen_captures.values():
+                    capture.running = True
                 self.status_bar.showMessage("Screen capture enabled")
                 logger.info("Screen capture enabled")
             else:
-                self.screen_capture.running = False
+                for capture in self.screen_captures.values():
+                    capture.running = False
                 self.status_bar.showMessage("Screen capture disabled")
                 logger.info("Screen capture disabled")
         except Exception as e:
             logger.error(f"Error toggling capture: {e}")
             self.status_bar.showMessage(f"Error: {e}")
 
+    def toggle_pyramid_matching(self, state: int):
+        """Toggle coarse-to-fine pyramid matching on/off."""
+        try:
+            enabled = state == Qt.CheckState.Checked.value
+            for capture in self.screen_captures.values():
+                capture.set_pyramid_matching(enabled)
+            self.status_bar.showMessage(f"Pyramid matching {'enabled' if enabled else 'disabled'}")
+        except Exception as e:
+            logger.error(f"Error toggling pyramid matching: {e}")
+            self.status_bar.showMessage(f"Error: {e}")
+
     def reload_macros(self):
         """Reload macros from disk."""
         try:
@@ -1767,16 +2447,21 @@ class MainWindow(QMainWindow):
     def update_countdown(self):
         """Update the countdown display."""
         try:
+            checked = self.screen_capture.frames_checked
+            if checked:
+                skipped = self.screen_capture.frames_skipped
+                self.skip_label.setText(f"Unchanged frames skipped: {skipped}/{checked} ({skipped / checked:.0%})")
+            
             if not self.capture_toggle.isChecked():
                 self.countdown_label.setText("Capture stopped")
                 return
                 
-            if not self.screen_capture.current_screenshot_time:
+            if not self.screen_capture.last_processing_time:
                 self.countdown_label.setText("Waiting for first capture...")
                 return
                 
             current_time = time.time()
-            time_until_next = self.screen_capture.check_interval - (current_time - self.screen_capture.current_screenshot_time)
+            time_until_next = self.screen_capture.next_capture_time - current_time
             
             if time_until_next <= 0:
                 self.countdown_label.setText("Taking screenshot...")
@@ -1816,13 +2501,57 @@ class MainWindow(QMainWindow):
         """Update the timing mode for screen capture."""
         try:
             mode = AppMode[mode_name]
-            self.screen_capture.set_timing_mode(mode)
+            for capture in self.screen_captures.values():
+                capture.set_timing_mode(mode)
             self.status_bar.showMessage(f"Timing mode set to {mode_name} ({mode.value} seconds)")
             logger.info(f"Timing mode updated to {mode_name}")
         except Exception as e:
             logger.error(f"Error updating timing mode: {e}")
             self.status_bar.showMessage(f"Error updating timing mode: {e}")
 
+    def update_capture_method(self, method_name):
+        """Update the capture backend for screen capture."""
+        try:
+            method = CaptureMethod[method_name]
+            for capture in self.screen_captures.values():
+                capture.set_capture_method(method)
+            self.status_bar.showMessage(f"Capture method set to {method_name}")
+            logger.info(f"Capture method updated to {method_name}")
+        except Exception as e:
+            logger.error(f"Error updating capture method: {e}")
+            self.status_bar.showMessage(f"Error updating capture method: {e}")
+
+    def update_match_workers(self, workers: int):
+        """Update the number of template matching workers."""
+        try:
+            match_pool = self.screen_capture.match_pool
+            match_pool.configure(workers)
+            self.status_bar.showMessage(f"Template matching workers set to {workers}")
+        except Exception as e:
+            logger.error(f"Error updating match workers: {e}")
+            self.status_bar.showMessage(f"Error updating match workers: {e}")
+
+    def select_device(self, index: int):
+        """Make the device in the selected preview tab the current one."""
+        try:
+            device_id = self.preview_tabs.tabText(index)
+            if device_id in self.screen_captures:
+                self.screen_capture = self.screen_captures[device_id]
+                self.preview_label = self.preview_labels[device_id]
+                self.device_combo.setCurrentText(device_id)
+                self.render_preview(device_id)
+        except Exception as e:
+            logger.error(f"Error selecting device: {e}")
+            self.status_bar.showMessage(f"Error: {e}")
+
+    def show_device_preview(self, device_id: str):
+        """Switch to a device's preview tab when it is picked in the device list."""
+        try:
+            if device_id in self.preview_labels:
+                self.preview_tabs.setCurrentWidget(self.preview_labels[device_id])
+        except Exception as e:
+            logger.error(f"Error showing device preview: {e}")
+
     def update_device_list(self):
         """Update the device list in the combo box."""
         try:
@@ -1869,10 +2598,13 @@ class BCAApp:
     """Main application class."""
     
     def __init__(self):
-        # Initialize with None device_id, will be set in setup()
+        # Initialize with no devices, will be set in setup()
+        self.screen_captures = []
         self.screen_capture = None
         self.user_manager = UserManager()
         self.macro_manager = None  # Will be initialized in setup()
+        self.template_cache = None
+        self.match_pool = None
         self.app = None
         self.window = None
     
@@ -1885,34 +2617,54 @@ class BCAApp:
                 logging.error("No devices found")
                 return False
             
-            # Use first device or let user select
-            device_id = None
+            # Use the only device or let user select one or more
             if len(devices) == 1:
-                device_id = devices[0]
+                selected = devices
             else:
-                print("\nSelect a device:")
+                print("\nSelect devices:")
                 for i, device in enumerate(devices, 1):
                     print(f"{i}. {device}")
-                choice = int(input("\nEnter device number: ")) - 1
-                if 0 <= choice < len(devices):
-                    device_id = devices[choice]
+                choice = input("\nEnter device numbers (comma-separated, Enter for all): ").strip()
+                if not choice:
+                    selected = devices
                 else:
-                    logging.error("Invalid device selection")
-                    return False
+                    indexes = [int(part) - 1 for part in choice.split(",") if part.strip()]
+                    if not indexes or any(not 0 <= index < len(devices) for index in indexes):
+                        logging.error("Invalid device selection")
+                        return False
+                    selected = [devices[index] for index in dict.fromkeys(indexes)]
             
-            if device_id:
-                logging.info(f"Selected device: {device_id}")
-                # Initialize ScreenCapture with selected device
-                self.screen_capture = ScreenCapture(device_id=device_id)
-                # Initialize MacroManager with ScreenCapture instance
-                self.macro_manager = MacroManager(screen_capture=self.screen_capture)
-                # Set macro_manager in screen_capture to establish bidirectional reference
-                self.screen_capture.set_macro_manager(self.macro_manager)
-                return True
-            else:
+            if not selected:
                 logging.error("No device selected")
                 return False
             
+            # Every device needs its own capture thread; what's left of the budget matches templates
+            if len(selected) > WORKER_BUDGET:
+                logging.warning(f"Worker budget allows {WORKER_BUDGET} devices, ignoring {selected[WORKER_BUDGET:]}")
+                selected = selected[:WORKER_BUDGET]
+            match_workers = min(DEFAULT_MATCH_WORKERS, WORKER_BUDGET - len(selected))
+            
+            # Devices share one template cache, match pool and macro store
+            self.template_cache = TemplateCache()
+            self.template_cache.start_watching()
+            self.match_pool = MatchPool(workers=match_workers)
+            
+            for device_id in selected:
+                logging.info(f"Selected device: {device_id}")
+                self.screen_captures.append(ScreenCapture(
+                    device_id=device_id,
+                    template_cache=self.template_cache,
+                    match_pool=self.match_pool
+                ))
+            self.screen_capture = self.screen_captures[0]
+            
+            # Initialize MacroManager with ScreenCapture instance
+            self.macro_manager = MacroManager(screen_capture=self.screen_capture)
+            # Set macro_manager in each screen_capture to establish bidirectional reference
+            for capture in self.screen_captures:
+                capture.set_macro_manager(self.macro_manager)
+            return True
+            
         except Exception as e:
             logging.error(f"Setup error: {e}")
             return False
@@ -1925,7 +2677,7 @@ class BCAApp:
         try:
             # Initialize Qt application
             self.app = QApplication(sys.argv)
-            self.window = MainWindow(self.screen_capture, self.user_manager, self.macro_manager)
+            self.window = MainWindow(self.screen_captures, self.user_manager, self.macro_manager)
             self.window.show()
             
             # Run event loop
@@ -1943,9 +2695,14 @@ class BCAApp:
                 self.window.close()
             if self.app:
                 self.app.quit()
-            if self.screen_capture:
-                self.screen_capture.running = False
-                self.screen_capture.wait()
+            for capture in self.screen_captures:
+                capture.stop()
+            for capture in self.screen_captures:
+                capture.wait()
+            if self.template_cache:
+                self.template_cache.stop_watching()
+            if self.match_pool:
+                self.match_pool.shutdown()
         except Exception as e:
             logging.error(f"Cleanup error: {e}")
 
@@ -3,16 +3,19 @@ import os
 import sqlite3
 import sys
 from datetime import datetime, timedelta
+from decimal import Decimal
 import colorama
 from colorama import Fore, Back, Style
 import json
+import hashlib
 import logging
 from pathlib import Path
-import configparser
-import psycopg2
 from psycopg2.extras import execute_values
+import pgpool
 import requests
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize colorama for cross-platform terminal colors
 colorama.init(autoreset=True)
@@ -28,6 +31,33 @@ os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(SCHEMA_DIR, exist_ok=True)
 os.makedirs(SQL_DIR, exist_ok=True)
 
+FETCH_CHUNK_SIZE = 2000  # Rows read from SQLite at a time, keeps memory flat as history grows
+
+# SQLite to PostgreSQL base type mapping, with better handling for large integers
+PG_TYPE_MAPPING = {
+    'INTEGER': 'NUMERIC',  # Changed from BIGINT to NUMERIC to handle large integers
+    'REAL': 'DOUBLE PRECISION',
+    'TEXT': 'TEXT',
+    'BLOB': 'BYTEA',
+    'CHAR': 'VARCHAR(50)',  # Changed from CHAR to VARCHAR(50) to handle variable length strings
+    'VARCHAR': 'VARCHAR',
+    'BOOLEAN': 'BOOLEAN',
+    'TIMESTAMP': 'TIMESTAMP',
+    'DATE': 'DATE',
+    'NUMERIC': 'NUMERIC',
+    'DECIMAL': 'DECIMAL'
+}
+
+# Incremental sync settings
+SYNC_STATE_TABLE = "bca_sync_state"  # Per-table watermarks and block hashes, kept in PostgreSQL since sql.db is replaced on every pull
+SYNC_WATERMARK_COLUMNS = {'DWJJOB': 'dwjDate', 'DWVVEH': 'dwvExpDat'}  # YYYYMMDD date column per table
+SYNC_BLOCK_ROWS = 1000  # Rowids per hashed block; only blocks whose hash changed are re-read and compared
+SYNC_LOOKBACK_DAYS = 14  # Blocks holding rows this recent are re-hashed since their status can still change
+SYNC_FULL_HASH_HOURS = 24  # Every block is re-hashed this often, catching edits outside the lookback window
+SYNC_KEY_BATCH = 1000  # Primary keys looked up per PostgreSQL query
+SYNC_COPY_THRESHOLD = 500  # Rows from which COPY into a staging table beats execute_values
+SYNC_WORKERS = 4  # Tables synced at once, each on its own pooled connection
+
 # Setup logging configuration
 LOG_FILE = os.path.join(LOG_DIR, f"db_editor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
 logging.basicConfig(
@@ -44,6 +74,32 @@ for handler in logging.getLogger().handlers:
     if isinstance(handler, logging.StreamHandler):
         handler.setLevel(logging.WARNING)
 
+class CopyRowStream:
+    """
+    File-like reader that formats rows into COPY text lines as copy_expert asks for them,
+    so a table never has to be built up in memory before it is sent.
+    """
+    def __init__(self, rows, format_value):
+        self.rows = iter(rows)
+        self.format_value = format_value
+        self.buffer = ''
+        self.row_count = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self.buffer += '\t'.join(self.format_value(value) for value in row) + '\n'
+            self.row_count += 1
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
 class SQLiteEditor:
     """
     A terminal-based SQLite database editor for handling Y/N/mixed data
@@ -61,6 +117,7 @@ class SQLiteEditor:
         self.changes_made = {}
         self.seen_records = set()
         self.schema_file = os.path.join(SCHEMA_DIR, "schema.json")
+        self.schema_lock = threading.Lock()
         self.schema_data = self.load_schema()
         self.pg_config = self.load_pg_config()
         # Load display settings from schema
@@ -187,25 +244,7 @@ class SQLiteEditor:
     
     def load_pg_config(self):
         """Load PostgreSQL configuration from sql.ini file."""
-        config = configparser.ConfigParser()
-        config_path = os.path.join(SQL_DIR, "sql.ini")
-        
-        if not os.path.exists(config_path):
-            logging.error(f"PostgreSQL configuration file not found at {config_path}")
-            return None
-            
-        try:
-            config.read(config_path)
-            return {
-                'host': config['SQL']['PG_HOST'],
-                'port': config['SQL']['PG_PORT'],
-                'database': config['SQL']['PG_DATABASE'],
-                'user': config['SQL']['PG_USERNAME'],
-                'password': config['SQL']['PG_PASSWORD']
-            }
-        except Exception as e:
-            logging.error(f"Error loading PostgreSQL configuration: {e}")
-            return None
+        return pgpool.load_pg_config()
     
     def check_db_exists(self):
         """Check if the database file exists at the expected location."""
@@ -580,38 +619,46 @@ class SQLiteEditor:
         except:
             return date_str
 
+    def iter_chunks(self, cursor, query, params=(), chunk_size=FETCH_CHUNK_SIZE):
+        """Run a query and yield its rows in fixed-size chunks, closing the cursor when done."""
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+        finally:
+            cursor.close()
+
     def compare_loads(self):
         """Compare two loads and show differences."""
         try:
-            # Get all jobs with their keys and load numbers
-            self.cursor.execute("""
-                SELECT * FROM DWJJOB 
-                ORDER BY dwjLoad, dwjType, dwjSeq
-            """)
-            jobs = self.cursor.fetchall()
-            
-            if not jobs:
-                print(f"{Fore.YELLOW}No jobs found.{Style.RESET_ALL}")
-                return
-            
             # Get column names
             self.cursor.execute("PRAGMA table_info(DWJJOB)")
             columns = self.cursor.fetchall()
             column_names = [col[1] for col in columns]
             
-            # Group jobs by load number
+            # Count each load's jobs in chunks instead of holding every job in memory
             load_groups = {}
-            for job in jobs:
-                load_num = job[column_names.index('dwjLoad')]
-                if load_num not in load_groups:
-                    load_groups[load_num] = []
-                load_groups[load_num].append(job)
+            for chunk in self.iter_chunks(self.connection.cursor(), """
+                SELECT dwjLoad,
+                       SUM(CASE WHEN dwjType = 'C' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN dwjType = 'D' THEN 1 ELSE 0 END)
+                FROM DWJJOB
+                GROUP BY dwjLoad
+                ORDER BY dwjLoad
+            """):
+                for load_num, collections, deliveries in chunk:
+                    load_groups[load_num] = (collections, deliveries)
+            
+            if not load_groups:
+                print(f"{Fore.YELLOW}No jobs found.{Style.RESET_ALL}")
+                return
             
             # Show available loads with their job counts
             print(f"\n{Fore.CYAN}Available Loads:{Style.RESET_ALL}")
-            for i, (load_num, load_jobs) in enumerate(load_groups.items(), 1):
-                collections = len([j for j in load_jobs if j[column_names.index('dwjType')] == "C"])
-                deliveries = len([j for j in load_jobs if j[column_names.index('dwjType')] == "D"])
+            for i, (load_num, (collections, deliveries)) in enumerate(load_groups.items(), 1):
                 print(f"{Fore.WHITE}{i}. {Fore.GREEN}{load_num}{Style.RESET_ALL} ({collections} collections, {deliveries} deliveries)")
             
             print(f"\n{Fore.CYAN}Enter two load numbers to compare (comma-separated):{Style.RESET_ALL}")
@@ -627,9 +674,12 @@ class SQLiteEditor:
                 load1 = list(load_groups.keys())[load1_idx - 1]
                 load2 = list(load_groups.keys())[load2_idx - 1]
                 
-                # Get jobs for both loads
-                load1_jobs = load_groups[load1]
-                load2_jobs = load_groups[load2]
+                # Get jobs for just the two loads being compared
+                job_sql = "SELECT * FROM DWJJOB WHERE dwjLoad = ? ORDER BY dwjType, dwjSeq"
+                self.cursor.execute(job_sql, (load1,))
+                load1_jobs = self.cursor.fetchall()
+                self.cursor.execute(job_sql, (load2,))
+                load2_jobs = self.cursor.fetchall()
                 
                 print(f"\n{Fore.CYAN}Comparing Loads {load1} and {load2}:{Style.RESET_ALL}")
                 
@@ -825,105 +875,112 @@ class SQLiteEditor:
             logging.error(f"Unexpected error in compare_vehicles: {e}")
             print(f"{Fore.RED}An unexpected error occurred: {e}{Style.RESET_ALL}")
 
+    def iter_load_groups(self):
+        """Yield (load number, job counts and locations) per load, reading DWJJOB in chunks."""
+        load_num = None
+        group = None
+        for chunk in self.iter_chunks(self.connection.cursor(), """
+            SELECT dwjLoad, dwjType, COUNT(*) as count, GROUP_CONCAT(dwjName) as locations
+            FROM DWJJOB 
+            GROUP BY dwjLoad, dwjType
+            ORDER BY dwjLoad, dwjType
+        """):
+            for row_load, job_type, count, locations in chunk:
+                if row_load != load_num:
+                    if group is not None:
+                        yield load_num, group
+                    load_num = row_load
+                    group = {'C': 0, 'D': 0, 'C_locations': [], 'D_locations': []}
+                group[job_type] = count
+                if job_type == 'C':
+                    group['C_locations'] = locations.split(',')
+                else:
+                    group['D_locations'] = locations.split(',')
+        if group is not None:
+            yield load_num, group
+
+    def print_load_summary(self, load_num, group):
+        """Print one load's collections, deliveries and cars."""
+        collections = group['C']
+        deliveries = group['D']
+        total = collections + deliveries
+        
+        # Get vehicles for this load
+        self.cursor.execute("""
+            SELECT dwvVehRef, dwvModDes
+            FROM DWVVEH
+            WHERE dwvLoad = ?
+            ORDER BY dwvVehRef
+        """, (load_num,))
+        vehicles = self.cursor.fetchall()
+        logging.info(f"Load {load_num}: Found {len(vehicles)} vehicles")
+        
+        # Format vehicle information
+        vehicle_info = []
+        for reg, make_model in vehicles:
+            reg = str(reg).strip() if reg else "Unknown"
+            make_model = str(make_model).strip() if make_model else "Unknown"
+            if reg and reg != "Unknown":
+                vehicle_info.append(f"{reg} ({make_model})")
+        
+        # Print load summary
+        print(f"{Fore.WHITE}{load_num:<15} | {Fore.YELLOW}{collections:<12} | {Fore.GREEN}{deliveries:<12} | {Fore.CYAN}{total:<12}{Style.RESET_ALL}")
+        
+        # Print collection locations
+        if group['C_locations']:
+            print(f"{Fore.YELLOW}Collections:{Style.RESET_ALL}")
+            for loc in group['C_locations']:
+                print(f"  {loc.strip()}")
+        
+        # Print delivery locations
+        if group['D_locations']:
+            print(f"{Fore.GREEN}Deliveries:{Style.RESET_ALL}")
+            for loc in group['D_locations']:
+                print(f"  {loc.strip()}")
+        
+        # Print vehicles in a 3-column table
+        if vehicle_info:
+            print(f"{Fore.WHITE}Cars:{Style.RESET_ALL}")
+            # Calculate column width (terminal width / 3, with some padding)
+            col_width = 40
+            
+            # Print table separator
+            print("-" * (col_width * 3 + 6))
+            
+            # Print vehicles in rows of 3
+            for i in range(0, len(vehicle_info), 3):
+                row = vehicle_info[i:i+3]
+                # Pad the row to always have 3 columns
+                while len(row) < 3:
+                    row.append("")
+                print(f"{Fore.WHITE}{row[0]:<{col_width}} | {row[1]:<{col_width}} | {row[2]:<{col_width}}{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.WHITE}No vehicles{Style.RESET_ALL}")
+        
+        print()  # Add blank line between loads
+
     def show_loads(self):
         """Show all loads with their collections and deliveries."""
         try:
             logging.info("Starting to show loads")
             
-            # Get all jobs grouped by load with location names
-            self.cursor.execute("""
-                SELECT dwjLoad, dwjType, COUNT(*) as count, GROUP_CONCAT(dwjName) as locations
-                FROM DWJJOB 
-                GROUP BY dwjLoad, dwjType
-                ORDER BY dwjLoad, dwjType
-            """)
-            load_stats = self.cursor.fetchall()
-            logging.info(f"Found {len(load_stats)} load statistics")
-            
-            if not load_stats:
+            # Print each load as soon as its jobs have been read
+            load_count = 0
+            for load_num, group in self.iter_load_groups():
+                if load_count == 0:
+                    # Print header
+                    print(f"\n{Fore.CYAN}Load Summary:{Style.RESET_ALL}")
+                    print(f"{Fore.WHITE}{'Load Number':<15} | {'Collections':<12} | {'Deliveries':<12} | {'Total Jobs':<12}{Style.RESET_ALL}")
+                    print("-" * 60)
+                self.print_load_summary(load_num, group)
+                load_count += 1
+            
+            if not load_count:
                 print(f"{Fore.YELLOW}No loads found in database.{Style.RESET_ALL}")
                 return
             
-            # Group by load number
-            load_groups = {}
-            for load_num, job_type, count, locations in load_stats:
-                if load_num not in load_groups:
-                    load_groups[load_num] = {'C': 0, 'D': 0, 'C_locations': [], 'D_locations': []}
-                load_groups[load_num][job_type] = count
-                if job_type == 'C':
-                    load_groups[load_num]['C_locations'] = locations.split(',')
-                else:
-                    load_groups[load_num]['D_locations'] = locations.split(',')
-            
-            logging.info(f"Grouped into {len(load_groups)} unique loads")
-            
-            # Print header
-            print(f"\n{Fore.CYAN}Load Summary:{Style.RESET_ALL}")
-            print(f"{Fore.WHITE}{'Load Number':<15} | {'Collections':<12} | {'Deliveries':<12} | {'Total Jobs':<12}{Style.RESET_ALL}")
-            print("-" * 60)
-            
-            # Print each load's summary
-            for load_num in sorted(load_groups.keys()):
-                collections = load_groups[load_num]['C']
-                deliveries = load_groups[load_num]['D']
-                total = collections + deliveries
-                
-                # Get vehicles for this load
-                self.cursor.execute("""
-                    SELECT dwvVehRef, dwvModDes
-                    FROM DWVVEH
-                    WHERE dwvLoad = ?
-                    ORDER BY dwvVehRef
-                """, (load_num,))
-                vehicles = self.cursor.fetchall()
-                logging.info(f"Load {load_num}: Found {len(vehicles)} vehicles")
-                
-                # Format vehicle information
-                vehicle_info = []
-                for reg, make_model in vehicles:
-                    reg = str(reg).strip() if reg else "Unknown"
-                    make_model = str(make_model).strip() if make_model else "Unknown"
-                    if reg and reg != "Unknown":
-                        vehicle_info.append(f"{reg} ({make_model})")
-                
-                # Print load summary
-                print(f"{Fore.WHITE}{load_num:<15} | {Fore.YELLOW}{collections:<12} | {Fore.GREEN}{deliveries:<12} | {Fore.CYAN}{total:<12}{Style.RESET_ALL}")
-                
-                # Print collection locations
-                if load_groups[load_num]['C_locations']:
-                    print(f"{Fore.YELLOW}Collections:{Style.RESET_ALL}")
-                    for loc in load_groups[load_num]['C_locations']:
-                        print(f"  {loc.strip()}")
-                
-                # Print delivery locations
-                if load_groups[load_num]['D_locations']:
-                    print(f"{Fore.GREEN}Deliveries:{Style.RESET_ALL}")
-                    for loc in load_groups[load_num]['D_locations']:
-                        print(f"  {loc.strip()}")
-                
-                # Print vehicles in a 3-column table
-                if vehicle_info:
-                    print(f"{Fore.WHITE}Cars:{Style.RESET_ALL}")
-                    # Calculate column width (terminal width / 3, with some padding)
-                    col_width = 40
-                    
-                    # Print table separator
-                    print("-" * (col_width * 3 + 6))
-                    
-                    # Print vehicles in rows of 3
-                    for i in range(0, len(vehicle_info), 3):
-                        row = vehicle_info[i:i+3]
-                        # Pad the row to always have 3 columns
-                        while len(row) < 3:
-                            row.append("")
-                        print(f"{Fore.WHITE}{row[0]:<{col_width}} | {row[1]:<{col_width}} | {row[2]:<{col_width}}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.WHITE}No vehicles{Style.RESET_ALL}")
-                
-                print()  # Add blank line between loads
-            
-            print(f"\n{Fore.CYAN}Total Loads: {len(load_groups)}{Style.RESET_ALL}")
-            logging.info(f"Completed showing {len(load_groups)} loads")
+            print(f"\n{Fore.CYAN}Total Loads: {load_count}{Style.RESET_ALL}")
+            logging.info(f"Completed showing {load_count} loads")
                 
         except sqlite3.Error as e:
             error_msg = f"Error showing loads: {str(e)}"
@@ -947,7 +1004,7 @@ class SQLiteEditor:
             print(f"{Fore.WHITE}Database: {self.pg_config.get('database', 'unknown')}{Style.RESET_ALL}")
             print(f"{Fore.WHITE}Username: {self.pg_config.get('user', 'unknown')}{Style.RESET_ALL}")
             
-            pg_conn = psycopg2.connect(**self.pg_config)
+            pg_conn = pgpool.get_connection()
             pg_cursor = pg_conn.cursor()
             
             # Test basic connection
@@ -978,8 +1035,6 @@ class SQLiteEditor:
                 print(f"  Extra: {sample[2]}")
                 print(f"  Notes: {sample[3]}")
             
-            pg_cursor.close()
-            pg_conn.close()
             print(f"{Fore.GREEN}Connection test completed successfully{Style.RESET_ALL}")
             return True
             
@@ -987,6 +1042,11 @@ class SQLiteEditor:
             print(f"{Fore.RED}Connection test failed: {e}{Style.RESET_ALL}")
             logging.error(f"PostgreSQL connection test failed: {e}")
             return False
+        finally:
+            if 'pg_cursor' in locals():
+                pg_cursor.close()
+            if 'pg_conn' in locals():
+                pgpool.release_connection(pg_conn)
 
     def run(self):
         """Run the main application loop."""
@@ -1077,7 +1137,8 @@ class SQLiteEditor:
                 input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
             
             elif choice == '5':
-                self.sync_to_postgres()
+                full = input(f"{Fore.CYAN}Run a full resync instead of incremental? (y/N):{Style.RESET_ALL} ").strip().lower() == 'y'
+                self.sync_to_postgres(full=full)
                 input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
             
             elif choice == '6':
@@ -1165,228 +1226,575 @@ class SQLiteEditor:
         # Implementation of find_missing_car_details method
         pass
 
-    def sync_to_postgres(self):
-        """Sync SQLite database to PostgreSQL with improved type handling and incremental updates"""
+    def ensure_sync_state_table(self, pg_cursor):
+        """Create the table holding per-table sync watermarks if needed."""
+        pg_cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                last_rowid BIGINT,
+                last_date NUMERIC,
+                row_count BIGINT,
+                content_hash TEXT,
+                block_hashes TEXT,
+                full_hashed_at TIMESTAMP,
+                synced_at TIMESTAMP
+            )
+        """)
+        pg_cursor.execute(f"ALTER TABLE {SYNC_STATE_TABLE} ADD COLUMN IF NOT EXISTS block_hashes TEXT")
+        pg_cursor.execute(f"ALTER TABLE {SYNC_STATE_TABLE} ADD COLUMN IF NOT EXISTS full_hashed_at TIMESTAMP")
+
+    def load_sync_state(self, pg_cursor, table_name):
+        """Return the watermarks recorded by the last sync of a table, or None."""
+        pg_cursor.execute(f"""
+            SELECT last_rowid, last_date, row_count, content_hash, block_hashes, full_hashed_at
+            FROM {SYNC_STATE_TABLE}
+            WHERE table_name = %s
+        """, (table_name,))
+        row = pg_cursor.fetchone()
+        if not row:
+            return None
+        return {
+            'last_rowid': row[0] or 0,
+            'last_date': int(row[1]) if row[1] is not None else None,
+            'row_count': row[2] or 0,
+            'content_hash': row[3],
+            'block_hashes': json.loads(row[4]) if row[4] else {},
+            'full_hashed_at': row[5]
+        }
+
+    def save_sync_state(self, pg_cursor, table_name, watermark, content_hash, block_hashes, full_hashed_at):
+        """Record the watermarks and block hashes reached by this sync of a table."""
+        pg_cursor.execute(f"""
+            INSERT INTO {SYNC_STATE_TABLE} (table_name, last_rowid, last_date, row_count, content_hash,
+                                            block_hashes, full_hashed_at, synced_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (table_name) DO UPDATE SET
+                last_rowid = EXCLUDED.last_rowid,
+                last_date = EXCLUDED.last_date,
+                row_count = EXCLUDED.row_count,
+                content_hash = EXCLUDED.content_hash,
+                block_hashes = EXCLUDED.block_hashes,
+                full_hashed_at = EXCLUDED.full_hashed_at,
+                synced_at = EXCLUDED.synced_at
+        """, (table_name, watermark['last_rowid'], watermark['last_date'], watermark['row_count'],
+              content_hash, json.dumps(block_hashes), full_hashed_at, datetime.now()))
+
+    def get_sync_watermark(self, sqlite_cursor, table_name, column_names):
+        """Read the current high-water marks of a SQLite table."""
+        date_column = SYNC_WATERMARK_COLUMNS.get(table_name)
+        date_select = f"MAX({date_column})" if date_column in column_names else "NULL"
+        sqlite_cursor.execute(f"SELECT MAX(rowid), COUNT(*), {date_select} FROM {table_name}")
+        last_rowid, row_count, last_date = sqlite_cursor.fetchone()
+        return {
+            'last_rowid': last_rowid or 0,
+            'row_count': row_count or 0,
+            'last_date': int(last_date) if last_date else None
+        }
+
+    def get_first_dirty_block(self, sqlite_cursor, table_name, column_names, state):
+        """
+        Return the first rowid block that can have changed since the last sync.
+        New rows land past last_rowid and only rows inside the lookback window are still
+        edited, so earlier blocks keep their recorded hashes until the next full hash.
+        """
+        if not state or not state['full_hashed_at']:
+            return 0
+        if datetime.now() - state['full_hashed_at'] >= timedelta(hours=SYNC_FULL_HASH_HOURS):
+            return 0
+
+        first_rowid = state['last_rowid'] + 1
+        date_column = SYNC_WATERMARK_COLUMNS.get(table_name)
+        if date_column in column_names and state['last_date']:
+            try:
+                cutoff = datetime.strptime(str(state['last_date']), '%Y%m%d') - timedelta(days=SYNC_LOOKBACK_DAYS)
+                sqlite_cursor.execute(f"SELECT MIN(rowid) FROM {table_name} WHERE {date_column} >= ?",
+                                      (int(cutoff.strftime('%Y%m%d')),))
+                recent_rowid = sqlite_cursor.fetchone()[0]
+                if recent_rowid is not None:
+                    first_rowid = min(first_rowid, recent_rowid)
+            except ValueError:
+                logging.warning(f"Invalid sync watermark {state['last_date']} for {table_name}")
+                return 0
+        return first_rowid // SYNC_BLOCK_ROWS
+
+    def hash_blocks(self, sqlite_conn, table_name, first_block=0):
+        """
+        Hash a SQLite table in blocks of SYNC_BLOCK_ROWS rowids, starting at first_block.
+        Every row read counts, so an edit anywhere in a hashed block changes its hash.
+        """
+        hashes = {}
+        query = f"SELECT rowid, * FROM {table_name} WHERE rowid >= ? ORDER BY rowid"
+        for chunk in self.iter_chunks(sqlite_conn.cursor(), query, (first_block * SYNC_BLOCK_ROWS,)):
+            for row in chunk:
+                block = str(row[0] // SYNC_BLOCK_ROWS)
+                if block not in hashes:
+                    hashes[block] = hashlib.sha1()
+                hashes[block].update(repr(row).encode())
+        return {block: digest.hexdigest() for block, digest in hashes.items()}
+
+    def fetch_pg_rows(self, pg_cursor, table_name, column_names, primary_keys, sqlite_rows, cache=None):
+        """
+        Fetch the PostgreSQL rows that correspond to a batch of SQLite rows.
+        Keyless tables without a date column are read once and kept in cache for the rest of the sync.
+        """
+        select_sql = f"SELECT {', '.join(column_names)} FROM {table_name}"
+
+        if primary_keys:
+            # Look the rows up by primary key
+            key_indexes = [column_names.index(pk) for pk in primary_keys]
+            keys = list({tuple(row[i] for i in key_indexes) for row in sqlite_rows})
+            pg_rows = set()
+            for start in range(0, len(keys), SYNC_KEY_BATCH):
+                batch = keys[start:start + SYNC_KEY_BATCH]
+                fetched = execute_values(
+                    pg_cursor,
+                    f"{select_sql} WHERE ({', '.join(primary_keys)}) IN (VALUES %s)",
+                    batch,
+                    page_size=len(batch),
+                    fetch=True
+                )
+                pg_rows.update(tuple(row) for row in fetched)
+            return pg_rows
+
+        date_column = SYNC_WATERMARK_COLUMNS.get(table_name)
+        if date_column in column_names:
+            # Without a key, compare against the date range the chunk spans
+            date_index = column_names.index(date_column)
+            dates = [row[date_index] for row in sqlite_rows if row[date_index] is not None]
+            clauses = []
+            params = []
+            if dates:
+                clauses.append(f"{date_column} BETWEEN %s AND %s")
+                params.extend([min(dates), max(dates)])
+            if len(dates) < len(sqlite_rows):
+                clauses.append(f"{date_column} IS NULL")
+            pg_cursor.execute(f"{select_sql} WHERE {' OR '.join(clauses)}", tuple(params))
+            return {tuple(row) for row in pg_cursor.fetchall()}
+
+        if cache is None:
+            cache = {}
+        if 'rows' not in cache:
+            pg_cursor.execute(select_sql)
+            cache['rows'] = {tuple(row) for row in pg_cursor.fetchall()}
+        return cache['rows']
+
+    def hash_row(self, row):
+        """Hash a row's values so SQLite and PostgreSQL copies compare equal."""
+        values = []
+        for value in row:
+            if value is None:
+                values.append('\0')
+            elif isinstance(value, bool):
+                values.append(str(int(value)))
+            elif isinstance(value, (int, float, Decimal)):
+                # NUMERIC columns come back as Decimal, so normalise numbers
+                values.append(format(Decimal(str(value)).normalize(), 'f'))
+            elif isinstance(value, (bytes, memoryview)):
+                values.append(bytes(value).hex())
+            else:
+                values.append(str(value))
+        return hashlib.sha1('\x1f'.join(values).encode()).hexdigest()
+
+    def diff_rows(self, column_names, primary_keys, sqlite_rows, pg_rows):
+        """Split SQLite rows into new, changed and unchanged against PostgreSQL."""
+        if not primary_keys:
+            # Without a key an edited row can only be told apart as a new one
+            sqlite_tuples = set(sqlite_rows)
+            return list(sqlite_tuples - pg_rows), [], len(sqlite_tuples & pg_rows)
+
+        key_indexes = [column_names.index(pk) for pk in primary_keys]
+        pg_hashes = {tuple(row[i] for i in key_indexes): self.hash_row(row) for row in pg_rows}
+
+        new_records = []
+        changed_records = []
+        unchanged = 0
+        for row in sqlite_rows:
+            pg_hash = pg_hashes.get(tuple(row[i] for i in key_indexes))
+            if pg_hash is None:
+                new_records.append(row)
+            elif pg_hash != self.hash_row(row):
+                changed_records.append(row)
+            else:
+                unchanged += 1
+        return new_records, changed_records, unchanged
+
+    def get_conflict_clause(self, column_names, primary_keys):
+        """Build the ON CONFLICT clause that turns an insert into an upsert."""
+        if not primary_keys:
+            return ""
+        update_columns = [col for col in column_names if col not in primary_keys]
+        if not update_columns:
+            return f" ON CONFLICT ({', '.join(primary_keys)}) DO NOTHING"
+        assignments = ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        return f" ON CONFLICT ({', '.join(primary_keys)}) DO UPDATE SET {assignments}"
+
+    def format_copy_value(self, value):
+        """Encode a value for PostgreSQL's COPY text format."""
+        if value is None:
+            return '\\N'
+        if isinstance(value, (bytes, memoryview)):
+            return '\\\\x' + bytes(value).hex()
+        return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+
+    def copy_rows(self, pg_cursor, table_name, column_names, primary_keys, rows):
+        """Bulk load rows through COPY into a staging table, then merge them in one statement.
+        rows can be any iterable, it is streamed rather than buffered. Returns the number of rows sent."""
+        staging_table = f"{table_name}_staging"
+        stream = CopyRowStream(rows, self.format_copy_value)
+
+        pg_cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        pg_cursor.execute(f"CREATE TEMP TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS)")
+        pg_cursor.copy_expert(
+            f"COPY {staging_table} ({', '.join(column_names)}) FROM STDIN",
+            stream
+        )
+        pg_cursor.execute(f"""
+            INSERT INTO {table_name} ({', '.join(column_names)})
+            SELECT {', '.join(column_names)} FROM {staging_table}
+        """ + self.get_conflict_clause(column_names, primary_keys))
+        pg_cursor.execute(f"DROP TABLE {staging_table}")
+        return stream.row_count
+
+    def upsert_rows(self, pg_cursor, table_name, column_names, primary_keys, rows):
+        """Insert rows into PostgreSQL, updating any whose primary key already exists."""
+        if len(rows) >= SYNC_COPY_THRESHOLD:
+            # Backfills go through COPY, small deltas aren't worth the staging table
+            self.copy_rows(pg_cursor, table_name, column_names, primary_keys, rows)
+            return
+
+        insert_sql = f"""
+            INSERT INTO {table_name} ({', '.join(column_names)})
+            VALUES %s
+        """ + self.get_conflict_clause(column_names, primary_keys)
+        execute_values(pg_cursor, insert_sql, rows, template=None, page_size=100)
+
+    def map_column_type(self, col_type):
+        """Map a SQLite column type to the PostgreSQL type used for it."""
+        col_type = col_type.upper()
+        
+        # Handle special types with precision
+        if 'SIGNED' in col_type:
+            if '(' in col_type:
+                precision = col_type[col_type.find('(')+1:col_type.find(')')]
+                if ',' in precision:  # Decimal type
+                    return f"DECIMAL({precision})"
+            return 'NUMERIC'  # Changed from BIGINT to NUMERIC
+        if 'DECIMAL' in col_type or 'NUMERIC' in col_type:
+            if '(' in col_type:
+                precision = col_type[col_type.find('(')+1:col_type.find(')')]
+                return f"DECIMAL({precision})"
+            return 'DECIMAL'
+        if col_type.startswith('CHAR('):
+            return f"VARCHAR({col_type[5:-1]})"  # Changed from CHAR to VARCHAR
+        if col_type.startswith('VARCHAR('):
+            return f"VARCHAR({col_type[8:-1]})"
+        return PG_TYPE_MAPPING.get(col_type.split('(')[0], 'TEXT')
+
+    def build_table_mapping(self, table_name, columns, pragma_hash):
+        """Work out the PostgreSQL columns, primary keys and CREATE TABLE for a SQLite table."""
+        pg_columns = [[col[1], self.map_column_type(col[2])] for col in columns]
+        primary_keys = [col[1] for col in columns if col[5] == 1]
+        
+        column_defs = [f"{name} {pg_type}" for name, pg_type in pg_columns]
+        create_sql = f"CREATE TABLE {table_name} ({', '.join(column_defs)}"
+        if primary_keys:
+            create_sql += f", PRIMARY KEY ({', '.join(primary_keys)})"
+        create_sql += ");"
+        
+        return {
+            'pragma_hash': pragma_hash,
+            'columns': pg_columns,
+            'primary_keys': primary_keys,
+            'ddl': create_sql
+        }
+
+    def get_cached_mapping(self, table_name, pragma_hash):
+        """Return the cached PostgreSQL mapping for a table if its SQLite schema hasn't changed."""
+        with self.schema_lock:
+            mapping = self.schema_data.get('pg_mapping', {}).get(table_name)
+        if mapping and mapping.get('pragma_hash') == pragma_hash:
+            return mapping
+        return None
+
+    def cache_table_mapping(self, table_name, mapping):
+        """Store a table's PostgreSQL mapping in schema.json."""
+        with self.schema_lock:
+            self.schema_data.setdefault('pg_mapping', {})[table_name] = mapping
+            self.save_schema()
+
+    def migrate_table(self, pg_cursor, table_name, mapping):
+        """Create the PostgreSQL table or add any columns it is missing.
+        Returns (created, added_columns)."""
+        pg_cursor.execute("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = %s
+        """, (table_name.lower(),))
+        existing_columns = {row[0] for row in pg_cursor.fetchall()}
+        
+        if not existing_columns:
+            logging.info(f"Creating table {table_name} with SQL: {mapping['ddl']}")
+            pg_cursor.execute(mapping['ddl'])
+            print(f"{Fore.GREEN}Created table {table_name}{Style.RESET_ALL}")
+            return True, []
+        
+        added_columns = []
+        for name, pg_type in mapping['columns']:
+            if name.lower() not in existing_columns:
+                logging.info(f"Adding column {name} {pg_type} to {table_name}")
+                pg_cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {name} {pg_type}")
+                print(f"{Fore.GREEN}Added column {name} to {table_name}{Style.RESET_ALL}")
+                added_columns.append(name)
+        return False, added_columns
+
+    def new_sync_stats(self):
+        """Return an empty set of sync counters."""
+        return {
+            'tables_processed': 0,
+            'tables_created': 0,
+            'tables_updated': 0,
+            'tables_skipped': 0,
+            'records_inserted': 0,
+            'records_updated': 0,
+            'records_unchanged': 0,
+            'errors': []
+        }
+
+    def sync_table(self, table_name, full=False):
+        """Sync one SQLite table to PostgreSQL in its own transaction and return its stats."""
+        stats = self.new_sync_stats()
+        logging.info(f"Processing table: {table_name}")
+        print(f"\n{Fore.CYAN}Processing table: {table_name}{Style.RESET_ALL}")
+        
+        # Each worker gets its own connections; neither driver shares them across threads
+        pg_conn = pgpool.get_connection()
+        pg_cursor = pg_conn.cursor()
+        sqlite_conn = sqlite3.connect(self.db_path)
+        sqlite_cursor = sqlite_conn.cursor()
+        
+        try:
+            # Get table schema from SQLite
+            sqlite_cursor.execute(f"PRAGMA table_info({table_name})")
+            columns = sqlite_cursor.fetchall()
+            logging.debug(f"Table {table_name} schema: {columns}")
+            
+            # Debug: Print column information for DWJJOB
+            if table_name == 'DWJJOB':
+                print(f"\n{Fore.YELLOW}DWJJOB Table Schema:{Style.RESET_ALL}")
+                for col in columns:
+                    print(f"Column: {col[1]}, Type: {col[2]}, PK: {col[5]}")
+                
+                # Additional debugging for DWJJOB
+                print(f"\n{Fore.YELLOW}DWJJOB Additional Checks:{Style.RESET_ALL}")
+                
+                # Check if table exists in SQLite
+                sqlite_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='DWJJOB'")
+                if not sqlite_cursor.fetchone():
+                    print(f"{Fore.RED}DWJJOB table does not exist in SQLite!{Style.RESET_ALL}")
+                    return stats
+                
+                # Check table size
+                sqlite_cursor.execute("SELECT COUNT(*) FROM DWJJOB")
+                count = sqlite_cursor.fetchone()[0]
+                print(f"Total rows in DWJJOB: {count}")
+                
+                # Get sample data if available
+                sqlite_cursor.execute("SELECT * FROM DWJJOB LIMIT 1")
+                sample = sqlite_cursor.fetchone()
+                if sample:
+                    print(f"\nSample row: {sample}")
+            
+            # Map the table to PostgreSQL, skipping introspection while the SQLite schema is unchanged
+            pragma_hash = hashlib.sha1(json.dumps(columns, default=str).encode()).hexdigest()
+            mapping = self.get_cached_mapping(table_name, pragma_hash)
+            if mapping is not None and not full:
+                # The cache lives on this machine; the database may have been reset or the table dropped
+                pg_cursor.execute("SELECT to_regclass(%s)", (table_name.lower(),))
+                if pg_cursor.fetchone()[0] is None:
+                    logging.warning(f"Table {table_name} is missing from PostgreSQL, recreating it")
+                    mapping = None
+            if mapping is None or full:
+                mapping = self.build_table_mapping(table_name, columns, pragma_hash)
+                created, added_columns = self.migrate_table(pg_cursor, table_name, mapping)
+                pg_conn.commit()
+                self.cache_table_mapping(table_name, mapping)
+                if created:
+                    stats['tables_created'] += 1
+                if created or added_columns:
+                    # Rows in unchanged blocks need the new table or columns filled in too
+                    full = True
+            primary_keys = mapping['primary_keys']
+            
+            # Get column names
+            column_names = [col[1] for col in columns]
+            
+            # Hash the table by rowid block and compare with the last sync (everything on a full sync)
+            state = None if full else self.load_sync_state(pg_cursor, table_name)
+            watermark = self.get_sync_watermark(sqlite_cursor, table_name, column_names)
+            
+            if not watermark['row_count']:
+                print(f"{Fore.YELLOW}No data in table {table_name}{Style.RESET_ALL}")
+                return stats
+            
+            # Only blocks past the watermarks are hashed, except on the periodic full hash
+            first_block = self.get_first_dirty_block(sqlite_cursor, table_name, column_names, state)
+            full_hashed_at = state['full_hashed_at'] if first_block else datetime.now()
+            block_hashes = {block: digest for block, digest in (state['block_hashes'] if state else {}).items()
+                            if int(block) < first_block}
+            block_hashes.update(self.hash_blocks(sqlite_conn, table_name, first_block))
+            content_hash = hashlib.sha256(json.dumps(block_hashes, sort_keys=True).encode()).hexdigest()
+            synced_hashes = state['block_hashes'] if state else {}
+            changed_blocks = sorted((int(block) for block, digest in block_hashes.items()
+                                     if synced_hashes.get(block) != digest))
+            logging.info(f"{len(changed_blocks)} of {len(block_hashes)} blocks changed in table {table_name}")
+            
+            # Nothing added, edited or removed in the hashed blocks
+            if state and state['content_hash'] == content_hash and not changed_blocks:
+                print(f"{Fore.YELLOW}No changes in {table_name} since last sync{Style.RESET_ALL}")
+                if not first_block:
+                    # Record the full hash so the next runs go back to hashing only recent blocks
+                    self.save_sync_state(pg_cursor, table_name, watermark, content_hash, block_hashes, full_hashed_at)
+                    pg_conn.commit()
+                stats['records_unchanged'] += watermark['row_count']
+                stats['tables_processed'] += 1
+                stats['tables_skipped'] += 1
+                return stats
+            
+            inserted = 0
+            updated = 0
+            unchanged = 0
+            compared = 0
+            candidate_count = 0
+            pg_cache = {}
+            try:
+                pg_cursor.execute(f"SELECT 1 FROM {table_name} LIMIT 1")
+                if pg_cursor.fetchone() is None:
+                    # Nothing to compare against, so stream the whole table straight into COPY
+                    rows = (row for chunk in self.iter_chunks(sqlite_conn.cursor(), f"SELECT * FROM {table_name} ORDER BY rowid")
+                            for row in chunk)
+                    inserted = self.copy_rows(pg_cursor, table_name, column_names, primary_keys, rows)
+                    candidate_count = inserted
+                    changed_blocks = []
+                
+                for block in changed_blocks:
+                    block_sql = f"SELECT * FROM {table_name} WHERE rowid >= ? AND rowid < ? ORDER BY rowid"
+                    block_params = (block * SYNC_BLOCK_ROWS, (block + 1) * SYNC_BLOCK_ROWS)
+                    for chunk in self.iter_chunks(sqlite_conn.cursor(), block_sql, block_params):
+                        candidate_count += len(chunk)
+                        
+                        # Get the matching records from PostgreSQL
+                        pg_rows = self.fetch_pg_rows(pg_cursor, table_name, column_names, primary_keys,
+                                                     chunk, pg_cache)
+                        compared += len(pg_rows)
+                        
+                        # Compare row hashes by primary key to find new and edited records
+                        new_records, changed_records, chunk_unchanged = self.diff_rows(
+                            column_names, primary_keys, chunk, pg_rows
+                        )
+                        
+                        # Send only new and changed records
+                        if new_records or changed_records:
+                            self.upsert_rows(pg_cursor, table_name, column_names, primary_keys,
+                                             new_records + changed_records)
+                            if not primary_keys:
+                                # Keep a cached keyless table in step with what was just inserted
+                                pg_rows.update(new_records)
+                        inserted += len(new_records)
+                        updated += len(changed_records)
+                        unchanged += chunk_unchanged
+                
+                # Debug: Print counts for DWJJOB
+                if table_name == 'DWJJOB':
+                    print(f"\n{Fore.YELLOW}DWJJOB Sync Status:{Style.RESET_ALL}")
+                    print(f"SQLite rows read: {candidate_count}")
+                    print(f"PostgreSQL rows compared: {compared}")
+                    print(f"New records to add: {inserted}")
+                    print(f"Changed records to update: {updated}")
+                
+                # Commit the watermark together with the rows it covers
+                self.save_sync_state(pg_cursor, table_name, watermark, content_hash, block_hashes, full_hashed_at)
+                pg_conn.commit()
+                if inserted or updated:
+                    print(f"{Fore.GREEN}{table_name}: added {inserted} new records, "
+                          f"updated {updated} changed records{Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.YELLOW}{table_name}: no new or changed records{Style.RESET_ALL}")
+                stats['records_inserted'] += inserted
+                stats['records_updated'] += updated
+                stats['records_unchanged'] += unchanged
+                
+            except Exception as e:
+                logging.error(f"Error processing records for table {table_name}: {str(e)}")
+                pg_conn.rollback()
+                inserted = updated = 0
+                stats['errors'].append(f"Record processing error in {table_name}: {str(e)}")
+            
+            stats['tables_processed'] += 1
+            if inserted or updated:
+                stats['tables_updated'] += 1
+            
+        except Exception as e:
+            error_msg = f"Error syncing table {table_name}: {str(e)}"
+            logging.error(error_msg)
+            print(f"{Fore.RED}{error_msg}{Style.RESET_ALL}")
+            stats['errors'].append(error_msg)
+            pg_conn.rollback()
+        finally:
+            sqlite_cursor.close()
+            sqlite_conn.close()
+            pg_cursor.close()
+            pgpool.release_connection(pg_conn)
+        
+        return stats
+
+    def sync_to_postgres(self, full=False, parallel=True):
+        """Sync SQLite database to PostgreSQL, shipping only rows changed since the last sync.
+        Returns the sync stats, or None if the sync could not run."""
         if not self.pg_config:
             logging.error("PostgreSQL configuration not found in sql.ini file")
             print(f"{Fore.RED}PostgreSQL configuration not found. Please check sql.ini file.{Style.RESET_ALL}")
             return
 
-        pg_conn = None
-        pg_cursor = None
-        sqlite_conn = None
-        sqlite_cursor = None
-
         try:
-            logging.info("Starting PostgreSQL sync process")
-            print(f"\n{Fore.CYAN}Starting PostgreSQL sync...{Style.RESET_ALL}")
-            
-            # Connect to both databases
-            pg_conn = psycopg2.connect(**self.pg_config)
-            pg_cursor = pg_conn.cursor()
-            sqlite_conn = sqlite3.connect(self.db_path)
-            sqlite_cursor = sqlite_conn.cursor()
+            logging.info(f"Starting PostgreSQL sync process ({'full' if full else 'incremental'})")
+            print(f"\n{Fore.CYAN}Starting {'full' if full else 'incremental'} PostgreSQL sync...{Style.RESET_ALL}")
             
             # Get list of tables from SQLite
-            sqlite_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = sqlite_cursor.fetchall()
+            sqlite_conn = sqlite3.connect(self.db_path)
+            try:
+                tables = [row[0] for row in sqlite_conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+            finally:
+                sqlite_conn.close()
             logging.info(f"Found {len(tables)} tables in SQLite database")
             
-            sync_stats = {
-                'tables_processed': 0,
-                'tables_created': 0,
-                'tables_updated': 0,
-                'records_inserted': 0,
-                'records_updated': 0,
-                'records_unchanged': 0,
-                'errors': []
-            }
+            workers = min(SYNC_WORKERS, len(tables)) if parallel else 1
             
-            for (table_name,) in tables:
-                logging.info(f"Processing table: {table_name}")
-                print(f"\n{Fore.CYAN}Processing table: {table_name}{Style.RESET_ALL}")
-                
-                try:
-                    # Get table schema from SQLite
-                    sqlite_cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns = sqlite_cursor.fetchall()
-                    logging.debug(f"Table {table_name} schema: {columns}")
-                    
-                    # Debug: Print column information for DWJJOB
-                    if table_name == 'DWJJOB':
-                        print(f"\n{Fore.YELLOW}DWJJOB Table Schema:{Style.RESET_ALL}")
-                        for col in columns:
-                            print(f"Column: {col[1]}, Type: {col[2]}, PK: {col[5]}")
-                        
-                        # Additional debugging for DWJJOB
-                        print(f"\n{Fore.YELLOW}DWJJOB Additional Checks:{Style.RESET_ALL}")
-                        
-                        # Check if table exists in SQLite
-                        sqlite_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='DWJJOB'")
-                        if not sqlite_cursor.fetchone():
-                            print(f"{Fore.RED}DWJJOB table does not exist in SQLite!{Style.RESET_ALL}")
-                            continue
-                        
-                        # Check table size
-                        sqlite_cursor.execute("SELECT COUNT(*) FROM DWJJOB")
-                        count = sqlite_cursor.fetchone()[0]
-                        print(f"Total rows in DWJJOB: {count}")
-                        
-                        # Get sample data if available
-                        sqlite_cursor.execute("SELECT * FROM DWJJOB LIMIT 1")
-                        sample = sqlite_cursor.fetchone()
-                        if sample:
-                            print(f"\nSample row: {sample}")
-                    
-                    # Map SQLite types to PostgreSQL types with better handling for large integers
-                    type_mapping = {
-                        'INTEGER': 'NUMERIC',  # Changed from BIGINT to NUMERIC to handle large integers
-                        'REAL': 'DOUBLE PRECISION',
-                        'TEXT': 'TEXT',
-                        'BLOB': 'BYTEA',
-                        'CHAR': 'VARCHAR(50)',  # Changed from CHAR to VARCHAR(50) to handle variable length strings
-                        'VARCHAR': 'VARCHAR',
-                        'BOOLEAN': 'BOOLEAN',
-                        'TIMESTAMP': 'TIMESTAMP',
-                        'DATE': 'DATE',
-                        'NUMERIC': 'NUMERIC',
-                        'DECIMAL': 'DECIMAL'
-                    }
-                    
-                    # Create column definitions
-                    column_defs = []
-                    primary_keys = []
-                    
-                    for col in columns:
-                        col_name = col[1]
-                        col_type = col[2].upper()
-                        
-                        # Handle special types with precision
-                        if 'SIGNED' in col_type:
-                            if '(' in col_type:
-                                precision = col_type[col_type.find('(')+1:col_type.find(')')]
-                                if ',' in precision:  # Decimal type
-                                    pg_type = f"DECIMAL({precision})"
-                                else:  # Integer type
-                                    pg_type = 'NUMERIC'  # Changed from BIGINT to NUMERIC
-                            else:
-                                pg_type = 'NUMERIC'  # Changed from BIGINT to NUMERIC
-                        elif 'DECIMAL' in col_type or 'NUMERIC' in col_type:
-                            if '(' in col_type:
-                                precision = col_type[col_type.find('(')+1:col_type.find(')')]
-                                pg_type = f"DECIMAL({precision})"
-                            else:
-                                pg_type = 'DECIMAL'
-                        elif col_type.startswith('CHAR('):
-                            pg_type = f"VARCHAR({col_type[5:-1]})"  # Changed from CHAR to VARCHAR
-                        elif col_type.startswith('VARCHAR('):
-                            pg_type = f"VARCHAR({col_type[8:-1]})"
-                        else:
-                            base_type = col_type.split('(')[0]
-                            pg_type = type_mapping.get(base_type, 'TEXT')
-                        
-                        is_pk = col[5] == 1
-                        if is_pk:
-                            primary_keys.append(col_name)
-                        
-                        column_defs.append(f"{col_name} {pg_type}")
-                    
-                    # Check if table exists in PostgreSQL
-                    pg_cursor.execute(f"""
-                        SELECT EXISTS (
-                            SELECT FROM information_schema.tables 
-                            WHERE table_name = '{table_name.lower()}'
-                        );
-                    """)
-                    table_exists = pg_cursor.fetchone()[0]
-                    
-                    if not table_exists:
-                        create_sql = f"CREATE TABLE {table_name} ({', '.join(column_defs)}"
-                        if primary_keys:
-                            create_sql += f", PRIMARY KEY ({', '.join(primary_keys)})"
-                        create_sql += ");"
-                        
-                        logging.info(f"Creating table {table_name} with SQL: {create_sql}")
-                        pg_cursor.execute(create_sql)
-                        pg_conn.commit()
-                        sync_stats['tables_created'] += 1
-                        print(f"{Fore.GREEN}Created table {table_name}{Style.RESET_ALL}")
-                    
-                    # Get data from SQLite
-                    sqlite_cursor.execute(f"SELECT * FROM {table_name}")
-                    sqlite_rows = sqlite_cursor.fetchall()
-                    logging.info(f"Found {len(sqlite_rows)} records in table {table_name}")
-                    
-                    if not sqlite_rows:
-                        print(f"{Fore.YELLOW}No data in table {table_name}{Style.RESET_ALL}")
-                        continue
-                    
-                    # Get column names
-                    column_names = [col[1] for col in columns]
-                    
-                    try:
-                        # Get existing records from PostgreSQL
-                        pg_cursor.execute(f"SELECT {', '.join(column_names)} FROM {table_name}")
-                        pg_rows = {tuple(row) for row in pg_cursor.fetchall()}
-                        
-                        # Convert SQLite rows to tuples for comparison
-                        sqlite_tuples = {tuple(row) for row in sqlite_rows}
-                        
-                        # Find new records (records that exist in SQLite but not in PostgreSQL)
-                        new_records = sqlite_tuples - pg_rows
-                        
-                        # Debug: Print counts for DWJJOB
-                        if table_name == 'DWJJOB':
-                            print(f"\n{Fore.YELLOW}DWJJOB Sync Status:{Style.RESET_ALL}")
-                            print(f"SQLite rows: {len(sqlite_rows)}")
-                            print(f"PostgreSQL rows: {len(pg_rows)}")
-                            print(f"New records to add: {len(new_records)}")
-                        
-                        # Insert only new records
-                        if new_records:
-                            insert_sql = f"""
-                                INSERT INTO {table_name} ({', '.join(column_names)})
-                                VALUES %s
-                            """
-                            psycopg2.extras.execute_values(
-                                pg_cursor, insert_sql, list(new_records),
-                                template=None,
-                                page_size=100
-                            )
-                            pg_conn.commit()
-                            sync_stats['records_inserted'] += len(new_records)
-                            print(f"{Fore.GREEN}Added {len(new_records)} new records{Style.RESET_ALL}")
-                        else:
-                            print(f"{Fore.YELLOW}No new records to add{Style.RESET_ALL}")
-                        
-                        # Count unchanged records
-                        unchanged_records = sqlite_tuples & pg_rows
-                        sync_stats['records_unchanged'] += len(unchanged_records)
-                        
-                    except Exception as e:
-                        logging.error(f"Error processing records for table {table_name}: {str(e)}")
-                        pg_conn.rollback()
-                        sync_stats['errors'].append(f"Record processing error in {table_name}: {str(e)}")
-                    
-                    sync_stats['tables_processed'] += 1
-                    if len(new_records) > 0:
-                        sync_stats['tables_updated'] += 1
-                    
-                except Exception as e:
-                    error_msg = f"Error syncing table {table_name}: {str(e)}"
-                    logging.error(error_msg)
-                    print(f"{Fore.RED}{error_msg}{Style.RESET_ALL}")
-                    sync_stats['errors'].append(error_msg)
-                    if pg_conn:
-                        pg_conn.rollback()
-                    continue
+            with pgpool.connection() as pg_conn:
+                with pg_conn.cursor() as pg_cursor:
+                    self.ensure_sync_state_table(pg_cursor)
+                pg_conn.commit()
+            
+            # One worker per table so a slow table doesn't hold up the others
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(lambda table: self.sync_table(table, full), tables))
+            else:
+                results = [self.sync_table(table_name, full) for table_name in tables]
+            
+            sync_stats = self.new_sync_stats()
+            for stats in results:
+                for key, value in stats.items():
+                    sync_stats[key] += value
             
             # Print sync summary
             print(f"\n{Fore.CYAN}Sync Summary:{Style.RESET_ALL}")
             print(f"Tables Processed: {sync_stats['tables_processed']}")
             print(f"Tables Created: {sync_stats['tables_created']}")
             print(f"Tables Updated: {sync_stats['tables_updated']}")
+            print(f"Tables Unchanged: {sync_stats['tables_skipped']}")
             print(f"Records Inserted: {sync_stats['records_inserted']}")
+            print(f"Records Updated: {sync_stats['records_updated']}")
             print(f"Records Unchanged: {sync_stats['records_unchanged']}")
             
             if sync_stats['errors']:
@@ -1396,22 +1804,12 @@ class SQLiteEditor:
             
             logging.info("PostgreSQL sync completed")
             print(f"\n{Fore.GREEN}PostgreSQL sync completed!{Style.RESET_ALL}")
+            return sync_stats
             
         except Exception as e:
             error_msg = f"Error during PostgreSQL sync: {str(e)}"
             logging.error(error_msg)
             print(f"{Fore.RED}{error_msg}{Style.RESET_ALL}")
-            if pg_conn:
-                pg_conn.rollback()
-        finally:
-            if sqlite_cursor:
-                sqlite_cursor.close()
-            if sqlite_conn:
-                sqlite_conn.close()
-            if pg_cursor:
-                pg_cursor.close()
-            if pg_conn:
-                pg_conn.close()
 
     def show_load_details(self, load_num):
         """Show detailed information about a specific load."""
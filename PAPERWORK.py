@@ -11,10 +11,16 @@ This module provides functions to generate:
 
 import os
 import random
+import io
+import pickle
+import multiprocessing
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
 import configparser
 import logging
 from datetime import datetime, timedelta, date
-import psycopg2
+import pgpool
+import loadrepo
 from openpyxl import load_workbook
 from openpyxl.drawing.image import Image as OpenpyxlImage
 import colorama
@@ -35,15 +41,26 @@ SQL_DIR = os.path.join(SCRIPT_DIR, "sql")
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(SQL_DIR, exist_ok=True)
 
+# Parsed templates, kept pickled per process and keyed by path and mtime
+TEMPLATE_DIR = os.path.join(SCRIPT_DIR, "templates")
+_template_cache = {}
+
+# Worker processes for rendering a week's loadsheets and timesheet at once; a week is only a dozen workbooks
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
 # Setup logging configuration
 LOG_FILE = os.path.join(LOG_DIR, f"paperwork_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE)
-    ]
-)
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+
+# Spawned render workers re-import this module; they log to the parent's file from init_render_worker
+if multiprocessing.current_process().name == "MainProcess":
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.FileHandler(LOG_FILE)
+        ]
+    )
 
 def print_header():
     """Print a modern header for the application."""
@@ -69,6 +86,22 @@ def print_menu():
     print(f"{Fore.WHITE}4. {Fore.YELLOW}Toggle Auto Signature{Style.RESET_ALL}")
     print(f"{Fore.WHITE}5. {Fore.YELLOW}Exit{Style.RESET_ALL}")
 
+def cache_template(template_name):
+    """Parse a template once and keep it pickled, re-parsing only when the file changes."""
+    template_path = os.path.join(TEMPLATE_DIR, template_name)
+    mtime = os.path.getmtime(template_path)
+    cached = _template_cache.get(template_path)
+    if cached is None or cached[0] != mtime:
+        # Unpickling a parsed workbook is several times quicker than re-reading the zip
+        cached = (mtime, pickle.dumps(load_workbook(template_path)))
+        _template_cache[template_path] = cached
+        logging.info(f"Parsed and cached template {template_path}")
+    return cached[1]
+
+def load_template(template_name):
+    """Return a fresh in-memory copy of a template workbook."""
+    return pickle.loads(cache_template(template_name))
+
 class SignatureConfig:
     """Configuration for signature placement and appearance."""
     def __init__(self):
@@ -142,25 +175,7 @@ class PaperworkManager:
         
     def load_pg_config(self):
         """Load PostgreSQL configuration from sql.ini file."""
-        config = configparser.ConfigParser()
-        config_path = os.path.join(SQL_DIR, "sql.ini")
-        
-        if not os.path.exists(config_path):
-            logging.error(f"PostgreSQL configuration file not found at {config_path}")
-            return None
-            
-        try:
-            config.read(config_path)
-            return {
-                'host': config['SQL']['PG_HOST'],
-                'port': config['SQL']['PG_PORT'],
-                'database': config['SQL']['PG_DATABASE'],
-                'user': config['SQL']['PG_USERNAME'],
-                'password': config['SQL']['PG_PASSWORD']
-            }
-        except Exception as e:
-            logging.error(f"Error loading PostgreSQL configuration: {e}")
-            return None
+        return pgpool.load_pg_config()
 
     def load_auto_signature_config(self):
         """Load auto signature setting from config file."""
@@ -242,7 +257,7 @@ class PaperworkManager:
         end_date_str = selected_sunday.strftime("%Y%m%d")
         
         try:
-            conn = psycopg2.connect(**self.pg_config)
+            conn = pgpool.get_connection()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -253,109 +268,42 @@ class PaperworkManager:
                 ORDER BY dwvload
             """, (start_date_str, end_date_str))
             
-            loads = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            return loads
+            return cursor.fetchall()
             
         except Exception as e:
             logging.error(f"Error getting loads for week: {e}")
             return []
+        finally:
+            if 'cursor' in locals():
+                cursor.close()
+            if 'conn' in locals():
+                pgpool.release_connection(conn)
 
     def get_load_info(self, load_number):
         """Get detailed information for a specific load."""
         try:
-            conn = psycopg2.connect(**self.pg_config)
-            cursor = conn.cursor()
-            
-            # Get collections with vehicle details
-            cursor.execute("""
-                SELECT 
-                    j.dwjtype,
-                    j.dwjcust,
-                    j.dwjname,
-                    j.dwjdate,
-                    j.dwjadrcod,
-                    j.dwjpostco,
-                    j.dwjvehs,
-                    v.dwvvehref,
-                    v.dwvmoddes,
-                    COALESCE(e.sparekeys, 'Y') as sparekeys,
-                    COALESCE(e.extra, 'Y') as extra,
-                    COALESCE(e.carnotes, '') as carnotes,
-                    v.dwvcolcod,
-                    v.dwvdelcod
-                FROM public.dwjjob j
-                LEFT JOIN public.dwvveh v ON j.dwjload = v.dwvload AND j.dwjadrcod = v.dwvcolcod
-                LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                WHERE j.dwjload = %s
-                AND j.dwjtype = 'C'
-                ORDER BY j.dwjdate, j.dwjcust
-            """, (load_number,))
-            
-            collections = cursor.fetchall()
-            
-            # Get deliveries with vehicle details
-            cursor.execute("""
-                SELECT 
-                    j.dwjtype,
-                    j.dwjcust,
-                    j.dwjname,
-                    j.dwjdate,
-                    j.dwjadrcod,
-                    j.dwjpostco,
-                    j.dwjvehs,
-                    v.dwvvehref,
-                    v.dwvmoddes,
-                    COALESCE(e.sparekeys, 'Y') as sparekeys,
-                    COALESCE(e.extra, 'Y') as extra,
-                    COALESCE(e.carnotes, '') as carnotes,
-                    v.dwvcolcod,
-                    v.dwvdelcod
-                FROM public.dwjjob j
-                LEFT JOIN public.dwvveh v ON j.dwjload = v.dwvload AND j.dwjadrcod = v.dwvdelcod
-                LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                WHERE j.dwjload = %s
-                AND j.dwjtype = 'D'
-                ORDER BY j.dwjdate, j.dwjcust
-            """, (load_number,))
-            
-            deliveries = cursor.fetchall()
+            load = loadrepo.fetch_load(load_number)
+            collections = load['collections']
+            deliveries = load['deliveries']
             
             if not collections and not deliveries:
                 print(f"{Fore.YELLOW}No details found for this load.{Style.RESET_ALL}")
                 return None
             
-            # Format collections with postcodes and vehicle details
-            formatted_collections = []
-            collection_vehicles = []
-            for collection in collections:
-                if collection[2] and collection[5]:  # Check if name and postcode exist
-                    formatted_collections.append(f"{collection[2]} - {collection[5]}")
-                elif collection[2]:  # If only name exists
-                    formatted_collections.append(collection[2])
-                
-                # Add vehicle details if available
-                if collection[7] and collection[8]:  # Check if vehicle reference and model exist
-                    collection_vehicles.append(f"{collection[7]} - {collection[8]}")
-            
-            # Format deliveries with postcodes and vehicle details
-            formatted_deliveries = []
-            delivery_vehicles = []
-            for delivery in deliveries:
-                if delivery[2] and delivery[5]:  # Check if name and postcode exist
-                    formatted_deliveries.append(f"{delivery[2]} - {delivery[5]}")
-                elif delivery[2]:  # If only name exists
-                    formatted_deliveries.append(delivery[2])
-                
-                # Add vehicle details if available
-                if delivery[7] and delivery[8]:  # Check if vehicle reference and model exist
-                    delivery_vehicles.append(f"{delivery[7]} - {delivery[8]}")
+            # Vehicles collected from and delivered to each job, in job order
+            collection_vehicles = [v for c in collections for v in loadrepo.get_job_vehicles(load, c)]
+            delivery_vehicles = [v for d in deliveries for v in loadrepo.get_job_vehicles(load, d)]
+            
+            # Format collections and deliveries with postcodes; one line per job and vehicle pairing
+            # (or per job without vehicles), the layout this summary has always used
+            formatted_collections = [loadrepo.format_location(c) for c in collections if c['dwjname']
+                                     for _ in loadrepo.get_job_vehicles(load, c) or [None]]
+            formatted_deliveries = [loadrepo.format_location(d) for d in deliveries if d['dwjname']
+                                    for _ in loadrepo.get_job_vehicles(load, d) or [None]]
             
             # Get the first collection date and contractor
-            first_collection_date = collections[0][3] if collections else None
-            contractor = collections[0][1] if collections else None
+            first_collection_date = collections[0]['dwjdate'] if collections else None
+            contractor = collections[0]['dwjcust'] if collections else None
             
             # Format the data for the loadsheet
             load_info = (
@@ -363,28 +311,25 @@ class PaperworkManager:
                 load_number,  # load number
                 '\n'.join(formatted_collections),  # collections
                 '\n'.join(formatted_deliveries),  # deliveries
-                len(collection_vehicles),  # collection cars count
-                len(delivery_vehicles),  # delivery cars count
+                len([v for v in collection_vehicles if v['dwvvehref'] and v['dwvmoddes']]),  # collection cars count
+                len([v for v in delivery_vehicles if v['dwvvehref'] and v['dwvmoddes']]),  # delivery cars count
                 contractor  # contractor
             )
             
             # Format vehicle data for the loadsheet
             formatted_vehicles = []
-            for collection in collections:
-                if collection[7] and collection[8]:  # Check if vehicle reference and model exist
+            for vehicle in collection_vehicles:
+                if vehicle['dwvvehref'] and vehicle['dwvmoddes']:  # Check if vehicle reference and model exist
                     formatted_vehicles.append((
-                        str(collection[7] or ''),  # registration
-                        str(collection[8] or ''),  # model
+                        str(vehicle['dwvvehref'] or ''),  # registration
+                        str(vehicle['dwvmoddes'] or ''),  # model
                         'N',  # offloaded (default)
                         'Y',  # documents (default)
-                        str(collection[7] or ''),  # key (using registration as key)
-                        str(collection[9] or 'Y'),  # spare keys
-                        str(collection[11] or '')   # notes
+                        str(vehicle['dwvvehref'] or ''),  # key (using registration as key)
+                        str(vehicle['sparekeys'] or 'Y'),  # spare keys
+                        str(vehicle['carnotes'] or '')   # notes
                     ))
             
-            cursor.close()
-            conn.close()
-            
             return {
                 'load_info': load_info,
                 'vehicles': formatted_vehicles
@@ -394,7 +339,7 @@ class PaperworkManager:
             logging.error(f"Error getting load info: {e}", exc_info=True)
             print(f"{Fore.RED}Error getting load info: {e}{Style.RESET_ALL}")
             return None
-
+    
     def show_load_summary(self, load_data):
         """Show a summary of the load information."""
         if not load_data:
@@ -459,8 +404,8 @@ class PaperworkManager:
         
         return True
 
-    def create_loadsheet(self, load_number):
-        """Create a loadsheet for the specified load."""
+    def create_loadsheet(self, load_number, load=None):
+        """Create a loadsheet for the specified load, fetching it unless already prefetched."""
         wb = None
         try:
             # Create loadsheets directory if it doesn't exist
@@ -468,93 +413,20 @@ class PaperworkManager:
             os.makedirs(loadsheets_dir, exist_ok=True)
             logging.info(f"Created/verified loadsheets directory: {loadsheets_dir}")
             
-            # Get load info directly from database
-            try:
-                conn = psycopg2.connect(**self.pg_config)
-                cursor = conn.cursor()
-                logging.info("Database connection successful")
-                print(f"{Fore.GREEN}Database connection successful.{Style.RESET_ALL}")
-            except Exception as e:
-                logging.error(f"Database connection failed: {e}")
-                print(f"{Fore.RED}Database connection failed: {e}{Style.RESET_ALL}")
-                return False
+            # Get the whole load from the database in one query
+            if load is None:
+                try:
+                    load = loadrepo.fetch_load(load_number)
+                except Exception as e:
+                    logging.error(f"Database query failed: {e}")
+                    print(f"{Fore.RED}Database query failed: {e}{Style.RESET_ALL}")
+                    return False
+            
+            collections = load['collections']
+            deliveries = load['deliveries']
+            vehicles = load['vehicles']
             
             try:
-                # Get collections
-                cursor.execute("""
-                    SELECT 
-                        j.dwjtype,
-                        j.dwjcust,
-                        j.dwjname,
-                        j.dwjdate,
-                        j.dwjadrcod,
-                        j.dwjpostco,
-                        j.dwjvehs,
-                        v.dwvvehref,
-                        v.dwvmoddes,
-                        COALESCE(e.sparekeys, 'Y') as sparekeys,
-                        COALESCE(e.extra, 'Y') as extra,
-                        COALESCE(e.carnotes, '') as carnotes,
-                        v.dwvcolcod,
-                        v.dwvdelcod
-                    FROM public.dwjjob j
-                    LEFT JOIN public.dwvveh v ON j.dwjload = v.dwvload AND j.dwjadrcod = v.dwvcolcod
-                    LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                    WHERE j.dwjload = %s
-                    AND j.dwjtype = 'C'
-                    ORDER BY j.dwjdate, j.dwjcust
-                """, (load_number,))
-                
-                collections = cursor.fetchall()
-                logging.info(f"Found {len(collections)} collections for load {load_number}")
-                
-                # Get deliveries
-                cursor.execute("""
-                    SELECT 
-                        j.dwjtype,
-                        j.dwjcust,
-                        j.dwjname,
-                        j.dwjdate,
-                        j.dwjadrcod,
-                        j.dwjpostco,
-                        j.dwjvehs,
-                        v.dwvvehref,
-                        v.dwvmoddes,
-                        COALESCE(e.sparekeys, 'Y') as sparekeys,
-                        COALESCE(e.extra, 'Y') as extra,
-                        COALESCE(e.carnotes, '') as carnotes,
-                        v.dwvcolcod,
-                        v.dwvdelcod
-                    FROM public.dwjjob j
-                    LEFT JOIN public.dwvveh v ON j.dwjload = v.dwvload AND j.dwjadrcod = v.dwvdelcod
-                    LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                    WHERE j.dwjload = %s
-                    AND j.dwjtype = 'D'
-                    ORDER BY j.dwjdate, j.dwjcust
-                """, (load_number,))
-                
-                deliveries = cursor.fetchall()
-                logging.info(f"Found {len(deliveries)} deliveries for load {load_number}")
-                
-                # Get vehicles
-                cursor.execute("""
-                    SELECT DISTINCT
-                        v.dwvvehref,
-                        v.dwvmoddes,
-                        v.dwvcolcod,
-                        v.dwvdelcod,
-                        COALESCE(e.sparekeys, 'Y') as sparekeys,
-                        COALESCE(e.extra, 'Y') as extra,
-                        COALESCE(e.carnotes, '') as carnotes
-                    FROM public.dwvveh v
-                    LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                    WHERE v.dwvload = %s
-                    ORDER BY v.dwvvehref
-                """, (load_number,))
-                
-                vehicles = cursor.fetchall()
-                logging.info(f"Found {len(vehicles)} vehicles for load {load_number}")
-                
                 if not collections and not deliveries:
                     logging.warning(f"No details found for load {load_number}")
                     print(f"{Fore.YELLOW}No details found for this load.{Style.RESET_ALL}")
@@ -563,9 +435,9 @@ class PaperworkManager:
                 # Get the date from the first collection or delivery
                 date_str = None
                 if collections:
-                    date_str = str(collections[0][3])
+                    date_str = str(collections[0]['dwjdate'])
                 elif deliveries:
-                    date_str = str(deliveries[0][3])
+                    date_str = str(deliveries[0]['dwjdate'])
                 
                 if not date_str:
                     logging.error(f"No date found for load {load_number}")
@@ -585,17 +457,17 @@ class PaperworkManager:
                 # Get town name from first collection or delivery
                 town_name = ""
                 if collections:
-                    town_name = collections[0][2] or ""  # dwjname from first collection
+                    town_name = collections[0]['dwjname'] or ""  # dwjname from first collection
                 elif deliveries:
-                    town_name = deliveries[0][2] or ""  # dwjname from first delivery
+                    town_name = deliveries[0]['dwjname'] or ""  # dwjname from first delivery
                 logging.info(f"Town name: {town_name}")
                 
                 # Set up the output file path
                 output_file = os.path.join(week_folder, f"{load_number}_{load_date.strftime('%d-%m-%Y')}_{town_name}.xlsx")
                 logging.info(f"Output file path: {output_file}")
                 
-                # Copy template to output file
-                template_path = os.path.join(SCRIPT_DIR, "templates", "loadsheet.xlsx")
+                # Check the template exists
+                template_path = os.path.join(TEMPLATE_DIR, "loadsheet.xlsx")
                 if not os.path.exists(template_path):
                     logging.error(f"Template file not found at {template_path}")
                     print(f"{Fore.RED}Template file not found at {template_path}{Style.RESET_ALL}")
@@ -610,12 +482,8 @@ class PaperworkManager:
                     except Exception as e:
                         logging.warning(f"Could not remove lock file: {e}")
                 
-                import shutil
-                shutil.copy2(template_path, output_file)
-                logging.info(f"Copied template to output file")
-                
-                # Load the workbook without data_only=True
-                wb = load_workbook(output_file)
+                # Start from an in-memory copy of the template; the sheet is written once on save
+                wb = load_template("loadsheet.xlsx")
                 
                 # Verify the worksheet exists
                 if "Loadsheet" not in wb.sheetnames:
@@ -639,7 +507,7 @@ class PaperworkManager:
                 # Update header information
                 if collections:
                     # Get the first collection date
-                    date_str = str(collections[0][3])
+                    date_str = str(collections[0]['dwjdate'])
                     try:
                         if len(date_str) == 8:  # Ensure date string is in YYYYMMDD format
                             date_obj = datetime.strptime(date_str, '%Y%m%d')
@@ -653,7 +521,7 @@ class PaperworkManager:
                 
                 if deliveries:
                     # Get the first delivery date
-                    date_str = str(deliveries[0][3])
+                    date_str = str(deliveries[0]['dwjdate'])
                     try:
                         if len(date_str) == 8:  # Ensure date string is in YYYYMMDD format
                             date_obj = datetime.strptime(date_str, '%Y%m%d')
@@ -667,7 +535,7 @@ class PaperworkManager:
                 
                 # Update collection date in signature section
                 if collections:
-                    date_str = str(collections[0][3])
+                    date_str = str(collections[0]['dwjdate'])
                     try:
                         if len(date_str) == 8:  # Ensure date string is in YYYYMMDD format
                             date_obj = datetime.strptime(date_str, '%Y%m%d')
@@ -687,7 +555,7 @@ class PaperworkManager:
                     # Create a set of unique collection locations
                     unique_collections = {}
                     for collection in collections:
-                        location = f"{collection[2]} - {collection[5]}" if collection[2] and collection[5] else collection[2] or ''
+                        location = loadrepo.format_location(collection)
                         if location not in unique_collections:
                             unique_collections[location] = 1
                         else:
@@ -702,7 +570,7 @@ class PaperworkManager:
                     # Create a set of unique delivery locations
                     unique_deliveries = {}
                     for delivery in deliveries:
-                        location = f"{delivery[2]} - {delivery[5]}" if delivery[2] and delivery[5] else delivery[2] or ''
+                        location = loadrepo.format_location(delivery)
                         if location not in unique_deliveries:
                             unique_deliveries[location] = 1
                         else:
@@ -717,13 +585,13 @@ class PaperworkManager:
                 formatted_vehicles = []
                 for vehicle in vehicles:
                     formatted_vehicles.append((
-                        str(vehicle[0] or ''),  # registration
-                        str(vehicle[1] or ''),  # model
+                        str(vehicle['dwvvehref'] or ''),  # registration
+                        str(vehicle['dwvmoddes'] or ''),  # model
                         'N',  # offloaded (default)
                         'Y',  # documents (default)
-                        str(vehicle[4] or 'Y'),  # spare keys
-                        str(vehicle[5] or 'Y'),  # extra (documents)
-                        str(vehicle[6] or '')   # notes
+                        str(vehicle['sparekeys'] or 'Y'),  # spare keys
+                        str(vehicle['extra'] or 'Y'),  # extra (documents)
+                        str(vehicle['carnotes'] or '')   # notes
                     ))
                 logging.info(f"Formatted {len(formatted_vehicles)} vehicles")
                 
@@ -769,10 +637,6 @@ class PaperworkManager:
                 print(f"{Fore.RED}Error during query execution: {e}{Style.RESET_ALL}")
                 return False
             finally:
-                if 'cursor' in locals():
-                    cursor.close()
-                if 'conn' in locals():
-                    conn.close()
                 if wb is not None:
                     try:
                         wb.close()
@@ -793,14 +657,9 @@ class PaperworkManager:
             
             # Set up output file path
             output_file = os.path.join(week_folder, f"timesheet_{selected_sunday.strftime('%Y%m%d')}.xlsx")
-            template_file = os.path.join(SCRIPT_DIR, "templates", "timesheet.xlsx")
             
-            # Copy template to output file
-            import shutil
-            shutil.copy2(template_file, output_file)
-            
-            # Load the workbook
-            workbook = load_workbook(output_file)
+            # Start from an in-memory copy of the template
+            workbook = load_template("timesheet.xlsx")
             ws = workbook["Timesheet"]
             
             # Helper functions
@@ -838,7 +697,7 @@ class PaperworkManager:
             conn = None
             cursor = None
             try:
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 print(f"{Fore.GREEN}Database connection successful.{Style.RESET_ALL}")
                 
@@ -925,14 +784,14 @@ class PaperworkManager:
                 if cursor:
                     cursor.close()
                 if conn:
-                    conn.close()
+                    pgpool.release_connection(conn)
                     
         except Exception as e:
             logging.error(f"Error in create_timesheet: {e}", exc_info=True)
             print(f"{Fore.RED}Error in create_timesheet: {e}{Style.RESET_ALL}")
             return False
 
-    def create_all_paperwork(self, selected_sunday):
+    def create_all_paperwork(self, selected_sunday, parallel=True):
         """Create all loadsheets and timesheet for the selected week."""
         try:
             # Calculate week start (Monday)
@@ -943,15 +802,22 @@ class PaperworkManager:
             print(f"{Fore.WHITE}Week Start (Monday): {Fore.YELLOW}{week_start.strftime('%A %d-%m-%Y')}{Style.RESET_ALL}")
             print(f"{Fore.WHITE}Week End (Sunday): {Fore.YELLOW}{week_end.strftime('%A %d-%m-%Y')}{Style.RESET_ALL}")
             
-            # Get all loads for the week
-            loads = self.get_loads_for_week(selected_sunday)
+            # Prefetch every load for the week so the loadsheets need no further queries
+            try:
+                week_loads = loadrepo.fetch_week(week_start.strftime("%Y%m%d"), week_end.strftime("%Y%m%d"))
+            except Exception as e:
+                logging.error(f"Error prefetching loads for week: {e}", exc_info=True)
+                print(f"{Fore.RED}Error getting loads for week: {e}{Style.RESET_ALL}")
+                return False
+            
+            loads = list(week_loads)
             if not loads:
                 print(f"{Fore.YELLOW}No loads found for this week.{Style.RESET_ALL}")
                 return False
 
             print(f"\n{Fore.CYAN}Found {len(loads)} loads for this week:{Style.RESET_ALL}")
             for load in loads:
-                print(f"{Fore.WHITE}Load: {Fore.YELLOW}{load[0]}{Style.RESET_ALL}")
+                print(f"{Fore.WHITE}Load: {Fore.YELLOW}{load}{Style.RESET_ALL}")
                 
             confirm = input(f"\n{Fore.YELLOW}Create all paperwork for this week? (y/n):{Style.RESET_ALL} ").strip().lower()
             if confirm != 'y':
@@ -974,6 +840,9 @@ class PaperworkManager:
             print(f"{Fore.WHITE}Loadsheets: {Fore.YELLOW}{week_folder}{Style.RESET_ALL}")
             print(f"{Fore.WHITE}Timesheet: {Fore.YELLOW}{timesheet_folder}{Style.RESET_ALL}")
             
+            if parallel and RENDER_WORKERS > 1:
+                return self.render_week_in_parallel(selected_sunday, week_loads)
+            
             # Create timesheet first
             print(f"\n{Fore.CYAN}Creating timesheet...{Style.RESET_ALL}")
             if not self.create_timesheet(selected_sunday):
@@ -983,17 +852,17 @@ class PaperworkManager:
             # Create loadsheets for each load
             print(f"\n{Fore.CYAN}Creating loadsheets...{Style.RESET_ALL}")
             for i, load in enumerate(loads, 1):
-                print(f"\n{Fore.YELLOW}Processing load {i} of {len(loads)}: {load[0]}{Style.RESET_ALL}")
+                print(f"\n{Fore.YELLOW}Processing load {i} of {len(loads)}: {load}{Style.RESET_ALL}")
                 
                 try:
-                    # Use the existing create_loadsheet method
-                    if not self.create_loadsheet(load[0]):
-                        print(f"{Fore.RED}Failed to create loadsheet for load {load[0]}. Skipping...{Style.RESET_ALL}")
+                    # Render from the prefetched load
+                    if not self.create_loadsheet(load, week_loads[load]):
+                        print(f"{Fore.RED}Failed to create loadsheet for load {load}. Skipping...{Style.RESET_ALL}")
                         continue
                     
                 except Exception as e:
-                    print(f"{Fore.RED}Error creating loadsheet for load {load[0]}: {e}{Style.RESET_ALL}")
-                    logging.error(f"Error creating loadsheet for load {load[0]}: {e}", exc_info=True)
+                    print(f"{Fore.RED}Error creating loadsheet for load {load}: {e}{Style.RESET_ALL}")
+                    logging.error(f"Error creating loadsheet for load {load}: {e}", exc_info=True)
                     continue
             
             print(f"\n{Fore.GREEN}All paperwork created successfully!{Style.RESET_ALL}")
@@ -1004,6 +873,53 @@ class PaperworkManager:
             print(f"{Fore.RED}Error creating paperwork: {e}{Style.RESET_ALL}")
             return False
 
+    def render_week_in_parallel(self, selected_sunday, week_loads):
+        """Render the timesheet and every prefetched loadsheet at once, one workbook per worker process."""
+        workers = min(RENDER_WORKERS, len(week_loads) + 1)
+        print(f"\n{Fore.CYAN}Creating timesheet and {len(week_loads)} loadsheets with {workers} workers...{Style.RESET_ALL}")
+        logging.info(f"Rendering week of {selected_sunday.strftime('%d-%m-%Y')} with {workers} workers")
+        
+        # Parse the templates once here and hand the pickles to each worker as it starts
+        for template_name in ("loadsheet.xlsx", "timesheet.xlsx"):
+            try:
+                cache_template(template_name)
+            except Exception as e:
+                logging.warning(f"Could not cache template {template_name}: {e}")
+        
+        failed_loads = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker,
+                                 initargs=(LOG_FILE, dict(_template_cache))) as executor:
+            timesheet_future = executor.submit(render_timesheet, selected_sunday)
+            load_futures = {load: executor.submit(render_loadsheet, load, data, self.auto_signature)
+                            for load, data in week_loads.items()}
+            
+            # Collect in order and print each worker's output here so the report reads the same every run
+            try:
+                timesheet_created, output = timesheet_future.result()
+                print(output, end="")
+            except Exception as e:
+                logging.error(f"Error creating timesheet: {e}", exc_info=True)
+                timesheet_created = False
+            
+            for load, future in load_futures.items():
+                try:
+                    created, output = future.result()
+                    print(output, end="")
+                    if not created:
+                        failed_loads.append(load)
+                except Exception as e:
+                    logging.error(f"Error creating loadsheet for load {load}: {e}", exc_info=True)
+                    failed_loads.append(load)
+        
+        for load in failed_loads:
+            print(f"{Fore.RED}Failed to create loadsheet for load {load}.{Style.RESET_ALL}")
+        if not timesheet_created:
+            print(f"{Fore.RED}Failed to create timesheet.{Style.RESET_ALL}")
+            return False
+        
+        print(f"\n{Fore.GREEN}All paperwork created successfully!{Style.RESET_ALL}")
+        return True
+
     def check_required_files(self):
         """Check if all required files and directories exist."""
         # Check template files
@@ -1289,6 +1205,29 @@ class PaperworkManager:
             
             input(f"\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}")
 
+def init_render_worker(log_file, templates):
+    """Set up a render worker process with the parent's log file and parsed templates."""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, handlers=[logging.FileHandler(log_file)])
+    _template_cache.update(templates)
+
+def render_loadsheet(load_number, load, auto_signature):
+    """Render one prefetched loadsheet in a worker process.
+    Returns (created, printed output) so the parent prints it without interleaving."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        manager = PaperworkManager()
+        manager.auto_signature = auto_signature
+        created = manager.create_loadsheet(load_number, load)
+    return created, output.getvalue()
+
+def render_timesheet(selected_sunday):
+    """Render a week's timesheet in a worker process.
+    Returns (created, printed output) so the parent prints it without interleaving."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        created = PaperworkManager().create_timesheet(selected_sunday)
+    return created, output.getvalue()
+
 if __name__ == "__main__":
     manager = PaperworkManager()
     try:
@@ -4,8 +4,8 @@ import sys
 from datetime import datetime, timedelta
 import colorama
 from colorama import Fore, Back, Style
-import psycopg2
-import configparser
+import pgpool
+import loadrepo
 import logging
 from pathlib import Path
 import json
@@ -42,25 +42,7 @@ class TimesheetManager:
         
     def load_pg_config(self):
         """Load PostgreSQL configuration from sql.ini file."""
-        config = configparser.ConfigParser()
-        config_path = os.path.join(SQL_DIR, "sql.ini")
-        
-        if not os.path.exists(config_path):
-            logging.error(f"PostgreSQL configuration file not found at {config_path}")
-            return None
-            
-        try:
-            config.read(config_path)
-            return {
-                'host': config['SQL']['PG_HOST'],
-                'port': config['SQL']['PG_PORT'],
-                'database': config['SQL']['PG_DATABASE'],
-                'user': config['SQL']['PG_USERNAME'],
-                'password': config['SQL']['PG_PASSWORD']
-            }
-        except Exception as e:
-            logging.error(f"Error loading PostgreSQL configuration: {e}")
-            return None
+        return pgpool.load_pg_config()
 
     def setup_database(self):
         """Create the hours table if it doesn't exist."""
@@ -69,7 +51,7 @@ class TimesheetManager:
             return
 
         try:
-            conn = psycopg2.connect(**self.pg_config)
+            conn = pgpool.get_connection()
             cursor = conn.cursor()
             
             # Create hours table
@@ -138,7 +120,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def add_work_day(self):
         """Add a new work day entry with interactive time selection."""
@@ -211,7 +193,7 @@ class TimesheetManager:
                         print(f"{Fore.RED}Invalid choice.{Style.RESET_ALL}")
                 
                 # Save to database
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 # Check if entry exists for this date
@@ -246,7 +228,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def show_weekly_hours(self):
         """Show hours worked for a selected week."""
@@ -301,7 +283,7 @@ class TimesheetManager:
                 week_start = selected_sunday - timedelta(days=6)  # Monday
                 
                 # Get data from database
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -341,7 +323,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def edit_work_day(self):
         """Edit an existing work day entry."""
@@ -365,7 +347,7 @@ class TimesheetManager:
                 selected_date = today - timedelta(days=day_idx)
                 
                 # Get current entry
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -447,7 +429,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def delete_work_day(self):
         """Delete a work day entry."""
@@ -477,7 +459,7 @@ class TimesheetManager:
                     return
                 
                 # Delete from database
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -501,7 +483,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def show_load_details(self):
         """Show load details for a selected week."""
@@ -562,7 +544,7 @@ class TimesheetManager:
                 logging.info(f"Selected date range: {start_date_str} to {end_date_str}")
                 
                 # Get data from database
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 # Get unique load numbers for the week
@@ -595,50 +577,14 @@ class TimesheetManager:
                     selected_load = loads[load_idx][0]
                     logging.info(f"Selected load: {selected_load}")
                     
-                    # Get vehicles with their collection and delivery locations
-                    cursor.execute("""
-                        SELECT DISTINCT 
-                            v.dwvvehref,
-                            v.dwvmoddes,
-                            v.dwvcolcod,
-                            v.dwvdelcod,
-                            c.dwjname as collection_name,
-                            d.dwjname as delivery_name,
-                            COALESCE(e.sparekeys, 'Y') as sparekeys,
-                            COALESCE(e.extra, 'Y') as extra,
-                            COALESCE(e.carnotes, '') as carnotes
-                        FROM public.dwvveh v
-                        LEFT JOIN public.dwjjob c ON v.dwvcolcod = c.dwjadrcod AND c.dwjtype = 'C' AND c.dwjload = %s
-                        LEFT JOIN public.dwjjob d ON v.dwvdelcod = d.dwjadrcod AND d.dwjtype = 'D' AND d.dwjload = %s
-                        LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-                        WHERE v.dwvload = %s
-                        AND v.dwvexpdat BETWEEN %s AND %s
-                        ORDER BY v.dwvvehref
-                    """, (selected_load, selected_load, selected_load, start_date_str, end_date_str))
-                    
-                    vehicles = cursor.fetchall()
-                    
-                    # Get collections
-                    cursor.execute("""
-                        SELECT DISTINCT dwjtype, dwjcust, dwjname, dwjdate, dwjadrcod
-                        FROM public.dwjjob
-                        WHERE dwjload = %s
-                        AND dwjtype = 'C'
-                        ORDER BY dwjdate, dwjcust
-                    """, (selected_load,))
-                    
-                    collections = cursor.fetchall()
-                    
-                    # Get deliveries
-                    cursor.execute("""
-                        SELECT DISTINCT dwjtype, dwjcust, dwjname, dwjdate, dwjadrcod
-                        FROM public.dwjjob
-                        WHERE dwjload = %s
-                        AND dwjtype = 'D'
-                        ORDER BY dwjdate, dwjcust
-                    """, (selected_load,))
-                    
-                    deliveries = cursor.fetchall()
+                    # Get the whole load in one query, keeping the vehicles that expire this week
+                    load = loadrepo.fetch_load(selected_load, cursor)
+                    vehicles = [v for v in load['vehicles']
+                                if v['dwvexpdat'] is not None and int(start_date_str) <= int(v['dwvexpdat']) <= int(end_date_str)]
+                    collections = list({(c['dwjtype'], c['dwjcust'], c['dwjname'], c['dwjdate'], c['dwjadrcod']): c
+                                        for c in load['collections']}.values())
+                    deliveries = list({(d['dwjtype'], d['dwjcust'], d['dwjname'], d['dwjdate'], d['dwjadrcod']): d
+                                       for d in load['deliveries']}.values())
                     
                     if not vehicles and not collections and not deliveries:
                         print(f"{Fore.YELLOW}No details found for this load.{Style.RESET_ALL}")
@@ -668,21 +614,21 @@ class TimesheetManager:
                                 for col_name, show in job_display_columns.items():
                                     if show:
                                         if col_name == "dwjType":
-                                            values.append(str(collection[0]))
+                                            values.append(str(collection['dwjtype']))
                                         elif col_name == "dwjCust":
-                                            values.append(str(collection[1]))
+                                            values.append(str(collection['dwjcust']))
                                         elif col_name == "dwjName":
-                                            values.append(str(collection[2]))
+                                            values.append(str(collection['dwjname']))
                                         elif col_name == "dwjDate":
-                                            values.append(datetime.strptime(str(collection[3]), "%Y%m%d").strftime("%d/%m/%Y"))
+                                            values.append(datetime.strptime(str(collection['dwjdate']), "%Y%m%d").strftime("%d/%m/%Y"))
                                 print(f"{' | '.join(values)}")
                                 
                                 # Show vehicles for this collection
-                                collection_vehicles = [v for v in vehicles if v[2] == collection[4]]  # Match dwvcolcod with dwjadrcod
+                                collection_vehicles = [v for v in vehicles if v['dwvcolcod'] == collection['dwjadrcod']]
                                 if collection_vehicles:
                                     print(f"{Fore.CYAN}  Vehicles:{Style.RESET_ALL}")
                                     for vehicle in collection_vehicles:
-                                        print(f"    {Fore.WHITE}{vehicle[0]} - {vehicle[1]}{Style.RESET_ALL}")
+                                        print(f"    {Fore.WHITE}{vehicle['dwvvehref']} - {vehicle['dwvmoddes']}{Style.RESET_ALL}")
                     
                     # Show deliveries with their vehicles
                     if deliveries:
@@ -702,21 +648,21 @@ class TimesheetManager:
                                 for col_name, show in job_display_columns.items():
                                     if show:
                                         if col_name == "dwjType":
-                                            values.append(str(delivery[0]))
+                                            values.append(str(delivery['dwjtype']))
                                         elif col_name == "dwjCust":
-                                            values.append(str(delivery[1]))
+                                            values.append(str(delivery['dwjcust']))
                                         elif col_name == "dwjName":
-                                            values.append(str(delivery[2]))
+                                            values.append(str(delivery['dwjname']))
                                         elif col_name == "dwjDate":
-                                            values.append(datetime.strptime(str(delivery[3]), "%Y%m%d").strftime("%d/%m/%Y"))
+                                            values.append(datetime.strptime(str(delivery['dwjdate']), "%Y%m%d").strftime("%d/%m/%Y"))
                                 print(f"{' | '.join(values)}")
                                 
                                 # Show vehicles for this delivery
-                                delivery_vehicles = [v for v in vehicles if v[3] == delivery[4]]  # Match dwvdelcod with dwjadrcod
+                                delivery_vehicles = [v for v in vehicles if v['dwvdelcod'] == delivery['dwjadrcod']]
                                 if delivery_vehicles:
                                     print(f"{Fore.CYAN}  Vehicles:{Style.RESET_ALL}")
                                     for vehicle in delivery_vehicles:
-                                        print(f"    {Fore.WHITE}{vehicle[0]} - {vehicle[1]}{Style.RESET_ALL}")
+                                        print(f"    {Fore.WHITE}{vehicle['dwvvehref']} - {vehicle['dwvmoddes']}{Style.RESET_ALL}")
                     
                     # Show all vehicles summary
                     if vehicles:
@@ -736,22 +682,22 @@ class TimesheetManager:
                                 for col_name, show in vehicle_display_columns.items():
                                     if show:
                                         if col_name == "dwvVehRef":
-                                            values.append(str(vehicle[0]))
+                                            values.append(str(vehicle['dwvvehref']))
                                         elif col_name == "dwvModDes":
-                                            values.append(str(vehicle[1]))
+                                            values.append(str(vehicle['dwvmoddes']))
                                         elif col_name == "spareKeys":
-                                            values.append(str(vehicle[6]))
+                                            values.append(str(vehicle['sparekeys']))
                                         elif col_name == "extra":
-                                            values.append(str(vehicle[7]))
+                                            values.append(str(vehicle['extra']))
                                         elif col_name == "carNotes":
-                                            values.append(str(vehicle[8]))
+                                            values.append(str(vehicle['carnotes']))
                                         else:
                                             values.append("")
                                 print(f"{' | '.join(values)}")
                                 
                                 # Show collection and delivery assignments
-                                collection_name = next((c[2] for c in collections if c[4] == vehicle[2]), "Unknown")
-                                delivery_name = next((d[2] for d in deliveries if d[4] == vehicle[3]), "Unknown")
+                                collection_name = next((c['dwjname'] for c in collections if c['dwjadrcod'] == vehicle['dwvcolcod']), "Unknown")
+                                delivery_name = next((d['dwjname'] for d in deliveries if d['dwjadrcod'] == vehicle['dwvdelcod']), "Unknown")
                                 print(f"    {Fore.CYAN}Collection: {collection_name} | Delivery: {delivery_name}{Style.RESET_ALL}")
                     
                 except ValueError:
@@ -767,12 +713,12 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def add_missing_cars(self):
         """Add missing cars to extracarinfo table with a clean interface."""
         try:
-            conn = psycopg2.connect(**self.pg_config)
+            conn = pgpool.get_connection()
             cursor = conn.cursor()
             
             # Get all vehicles from dwvveh that aren't in extracarinfo
@@ -885,7 +831,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def edit_car_info(self):
         """Edit extra information for a car."""
@@ -929,7 +875,7 @@ class TimesheetManager:
                 end_date_str = selected_sunday.strftime("%Y%m%d")
                 
                 # Get loads for the week
-                conn = psycopg2.connect(**self.pg_config)
+                conn = pgpool.get_connection()
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -1083,7 +1029,7 @@ class TimesheetManager:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
-                conn.close()
+                pgpool.release_connection(conn)
 
     def manage_work_week(self):
         """Manage work hours for a selected week."""
@@ -1122,19 +1068,19 @@ class TimesheetManager:
                 
                 week_start = selected_sunday - timedelta(days=6)  # Monday
                 
+                # Check a connection out per menu action so none sits idle in a transaction while we wait for input
                 while True:
                     # Get current week's data
-                    conn = psycopg2.connect(**self.pg_config)
-                    cursor = conn.cursor()
-                    
-                    cursor.execute("""
-                        SELECT work_date, start_time, finish_time, total_hours
-                        FROM public.hours
-                        WHERE work_date BETWEEN %s AND %s
-                        ORDER BY work_date
-                    """, (week_start.date(), selected_sunday.date()))
-                    
-                    entries = cursor.fetchall()
+                    with pgpool.connection() as conn:
+                        with conn.cursor() as cursor:
+                            cursor.execute("""
+                                SELECT work_date, start_time, finish_time, total_hours
+                                FROM public.hours
+                                WHERE work_date BETWEEN %s AND %s
+                                ORDER BY work_date
+                            """, (week_start.date(), selected_sunday.date()))
+                            entries = cursor.fetchall()
+                        conn.rollback()
                     
                     # Clear screen and show menu
                     os.system('cls' if os.name == 'nt' else 'clear')
@@ -1229,20 +1175,20 @@ class TimesheetManager:
                                 else:
                                     print(f"{Fore.RED}Invalid choice.{Style.RESET_ALL}")
                             
-                            # Save to database
-                            if current_entry:
-                                cursor.execute("""
-                                    UPDATE public.hours 
-                                    SET start_time = %s::time(0), finish_time = %s::time(0), updated_at = CURRENT_TIMESTAMP
-                                    WHERE work_date = %s
-                                """, (f"{start_hour:02d}:00", f"{finish_hour:02d}:00", selected_date.date()))
-                            else:
-                                cursor.execute("""
-                                    INSERT INTO public.hours (work_date, start_time, finish_time)
-                                    VALUES (%s, %s::time(0), %s::time(0))
-                                """, (selected_date.date(), f"{start_hour:02d}:00", f"{finish_hour:02d}:00"))
-                            
-                            conn.commit()
+                            # Save to database; the entry may have been added or removed while we waited for input
+                            with pgpool.connection() as conn:
+                                with conn.cursor() as cursor:
+                                    cursor.execute("""
+                                        UPDATE public.hours 
+                                        SET start_time = %s::time(0), finish_time = %s::time(0), updated_at = CURRENT_TIMESTAMP
+                                        WHERE work_date = %s
+                                    """, (f"{start_hour:02d}:00", f"{finish_hour:02d}:00", selected_date.date()))
+                                    if cursor.rowcount == 0:
+                                        cursor.execute("""
+                                            INSERT INTO public.hours (work_date, start_time, finish_time)
+                                            VALUES (%s, %s::time(0), %s::time(0))
+                                        """, (selected_date.date(), f"{start_hour:02d}:00", f"{finish_hour:02d}:00"))
+                                conn.commit()
                             print(f"{Fore.GREEN}Times saved successfully!{Style.RESET_ALL}")
                             
                         except ValueError:
@@ -1269,12 +1215,18 @@ class TimesheetManager:
                             confirm = input(f"{Fore.YELLOW}Are you sure you want to delete the entry for {date_to_delete.strftime('%A %d-%m-%Y')}? (y/n):{Style.RESET_ALL} ").strip().lower()
                             
                             if confirm == 'y':
-                                cursor.execute("""
-                                    DELETE FROM public.hours
-                                    WHERE work_date = %s
-                                """, (date_to_delete,))
-                                conn.commit()
-                                print(f"{Fore.GREEN}Entry deleted successfully!{Style.RESET_ALL}")
+                                with pgpool.connection() as conn:
+                                    with conn.cursor() as cursor:
+                                        cursor.execute("""
+                                            DELETE FROM public.hours
+                                            WHERE work_date = %s
+                                        """, (date_to_delete,))
+                                        deleted = cursor.rowcount
+                                    conn.commit()
+                                if deleted:
+                                    print(f"{Fore.GREEN}Entry deleted successfully!{Style.RESET_ALL}")
+                                else:
+                                    print(f"{Fore.YELLOW}Entry had already been deleted.{Style.RESET_ALL}")
                             else:
                                 print(f"{Fore.YELLOW}Deletion cancelled.{Style.RESET_ALL}")
                             
@@ -1285,11 +1237,6 @@ class TimesheetManager:
                         break
                     else:
                         print(f"{Fore.RED}Invalid choice.{Style.RESET_ALL}")
-                    
-                    if 'cursor' in locals():
-                        cursor.close()
-                    if 'conn' in locals():
-                        conn.close()
                 
             except ValueError:
                 print(f"{Fore.RED}Invalid input.{Style.RESET_ALL}")
@@ -1297,11 +1244,6 @@ class TimesheetManager:
         except Exception as e:
             logging.error(f"Error managing work week: {e}")
             print(f"{Fore.RED}Error managing work week: {e}{Style.RESET_ALL}")
-        finally:
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conn' in locals():
-                conn.close()
 
     def print_menu(self):
         """Print the menu with fancy formatting."""
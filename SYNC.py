@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Sync Daemon
+
+Keeps PostgreSQL a few minutes behind the phone without anyone using the menus:
+1. Stat the BCA Track database on the device every interval
+2. Pull it with ADB.py's handle_sql_db only when the device copy looks different
+3. Check whether the pulled sql.db really changed (size, SQLite change counter, hash)
+4. Run DB.py's incremental PostgreSQL sync only when it did
+
+Usage: python SYNC.py [--device SERIAL] [--interval SECONDS] [--once]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from colorama import Fore, Style
+
+from ADB import APP_PACKAGE, DB_DIR, DB_PATH, check_adb_devices, ensure_directories_exist, handle_sql_db, run_adb_command
+from DB import LOG_DIR, SQLiteEditor
+
+# Daemon settings
+SYNC_INTERVAL = 300  # Seconds between device checks
+DEVICE_DB_PATH = f"/data/data/{APP_PACKAGE}/cache/cache/data/sql.db"
+STATE_FILE = os.path.join(DB_DIR, "sync_daemon.json")
+SQLITE_HEADER = b"SQLite format 3\x00"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Log to a file of our own alongside DB.py's log
+LOG_FILE = os.path.join(LOG_DIR, f"sync_daemon_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+logging.getLogger().addHandler(_file_handler)
+
+def load_state():
+    """Load what the daemon saw at its last successful sync."""
+    try:
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading sync daemon state: {e}")
+    return {}
+
+def save_state(state):
+    """Save the daemon state so a restart doesn't resync an unchanged database."""
+    try:
+        with open(STATE_FILE, 'w') as f:
+            json.dump(state, f, indent=4)
+    except Exception as e:
+        logging.error(f"Error saving sync daemon state: {e}")
+
+def get_remote_stat(device):
+    """Return the size and mtime of the database on the device, or None if it can't be read."""
+    adb_prefix = f"adb -s {device} " if device else "adb "
+    return run_adb_command(f"{adb_prefix}shell su 0 stat -c %s:%Y {DEVICE_DB_PATH}", shell=True) or None
+
+def read_db_signature(path):
+    """
+    Fingerprint a local SQLite file by size, header change counter and content hash.
+
+    The change counter (header bytes 24-27) is what SQLite's data_version is
+    derived from, and unlike the PRAGMA it survives the file being replaced.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(100)
+        change_counter = int.from_bytes(header[24:28], 'big') if header.startswith(SQLITE_HEADER) else None
+        digest = hashlib.sha256(header)
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return {
+        'size': os.path.getsize(path),
+        'change_counter': change_counter,
+        'sha256': digest.hexdigest()
+    }
+
+def select_device(device=None):
+    """Use the requested device if connected, otherwise the first connected one."""
+    devices = check_adb_devices()
+    if not devices:
+        return None
+    if device:
+        return device if device in devices else None
+    return devices[0]
+
+def sync_once(editor, state, device=None):
+    """Run one pull-and-sync cycle. Returns True if PostgreSQL was synced."""
+    device = select_device(device)
+    if not device:
+        logging.warning("No device connected, skipping this cycle")
+        print(f"{Fore.YELLOW}No device connected, skipping this cycle{Style.RESET_ALL}")
+        return False
+
+    # Only pull when the device copy looks different from the last one we synced
+    remote_stat = get_remote_stat(device)
+    if remote_stat and remote_stat == state.get('remote_stat') and os.path.exists(DB_PATH):
+        logging.info(f"Device database unchanged ({remote_stat}), skipping pull")
+        print(f"{Fore.CYAN}Device database unchanged, skipping pull{Style.RESET_ALL}")
+        return False
+
+    if not handle_sql_db("pull", device):
+        logging.error("Failed to pull database from device")
+        return False
+
+    # The device mtime also moves on writes that leave the data as it was
+    signature = read_db_signature(DB_PATH)
+    if signature == state.get('signature'):
+        logging.info("Pulled database is identical to the last synced copy")
+        print(f"{Fore.CYAN}Pulled database unchanged, skipping sync{Style.RESET_ALL}")
+        state['remote_stat'] = remote_stat
+        save_state(state)
+        return False
+
+    logging.info(f"Database changed (size {signature['size']}, change counter {signature['change_counter']}), syncing")
+    sync_stats = editor.sync_to_postgres()
+    if sync_stats is None or sync_stats['errors']:
+        # Leave the state alone so the next cycle tries again
+        logging.error("PostgreSQL sync did not complete cleanly, will retry next cycle")
+        return False
+
+    state.update({
+        'remote_stat': remote_stat,
+        'signature': signature,
+        'last_sync': datetime.now().isoformat(timespec='seconds')
+    })
+    save_state(state)
+    return True
+
+def main():
+    """Parse arguments and run the sync loop."""
+    parser = argparse.ArgumentParser(description="Continuously sync the BCA Track database to PostgreSQL")
+    parser.add_argument('--device', help="ADB serial or IP of the device to pull from (default: first connected)")
+    parser.add_argument('--interval', type=int, default=SYNC_INTERVAL, help=f"Seconds between checks (default: {SYNC_INTERVAL})")
+    parser.add_argument('--once', action='store_true', help="Run a single cycle and exit")
+    args = parser.parse_args()
+
+    ensure_directories_exist()
+    editor = SQLiteEditor()
+    if not editor.pg_config:
+        print(f"{Fore.RED}PostgreSQL configuration not found. Please check sql.ini file.{Style.RESET_ALL}")
+        sys.exit(1)
+
+    state = load_state()
+    logging.info(f"Starting sync daemon (interval {args.interval}s, device {args.device or 'auto'})")
+    print(f"{Fore.CYAN}Sync daemon started, checking every {args.interval}s{Style.RESET_ALL}")
+
+    while True:
+        started = time.monotonic()
+        try:
+            sync_once(editor, state, args.device)
+        except Exception as e:
+            logging.error(f"Sync cycle failed: {e}", exc_info=True)
+            print(f"{Fore.RED}Sync cycle failed: {e}{Style.RESET_ALL}")
+
+        if args.once:
+            break
+        time.sleep(max(0, args.interval - (time.monotonic() - started)))
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Sync daemon stopped{Style.RESET_ALL}")
+        logging.info("Sync daemon stopped by user")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Template matching benchmark
+
+Times MatchPool on a synthetic 1080x2400 frame for a growing number of
+templates, sequentially and with thread workers, and prints the speedup of
+the thread pool over sequential matching.
+
+Usage: python benchmark_matching.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+from BCAapp import MatchPool, MatchTask, DEFAULT_MATCH_WORKERS
+
+FRAME_SIZE = (2400, 1080)  # height, width of our devices
+TEMPLATE_SIZE = (120, 360)  # height, width of a typical trigger image
+TEMPLATE_COUNTS = [1, 4, 8, 16, 32]
+REPEATS = 3
+
+def make_frame_and_templates(count, seed=0):
+    """Build a noise frame and `count` templates cropped from it."""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, FRAME_SIZE, dtype=np.uint8)
+    templates = []
+    for i in range(count):
+        y = int(rng.integers(0, FRAME_SIZE[0] - TEMPLATE_SIZE[0]))
+        x = int(rng.integers(0, FRAME_SIZE[1] - TEMPLATE_SIZE[1]))
+        crop = frame[y:y + TEMPLATE_SIZE[0], x:x + TEMPLATE_SIZE[1]]
+        templates.append(MatchTask(f"template_{i:02d}.png", np.ascontiguousarray(crop)))
+    return frame, templates
+
+def time_pool(pool, frame, templates):
+    """Best-of-REPEATS wall clock for matching one frame."""
+    pool.match_all(frame, templates)  # Warm up the workers
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        pool.match_all(frame, templates)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    workers = DEFAULT_MATCH_WORKERS
+    print(f"\nFrame {FRAME_SIZE[1]}x{FRAME_SIZE[0]}, template {TEMPLATE_SIZE[1]}x{TEMPLATE_SIZE[0]}, "
+          f"{workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'Templates':>10} | {'Sequential':>11} | {'Threads':>11} | {'Speedup':>8}")
+    print("-" * 50)
+
+    pools = {
+        'sequential': MatchPool(workers=0),
+        'threads': MatchPool(workers=workers),
+    }
+    try:
+        for count in TEMPLATE_COUNTS:
+            frame, templates = make_frame_and_templates(count)
+            timings = {name: time_pool(pool, frame, templates) for name, pool in pools.items()}
+            speedup = timings['sequential'] / timings['threads']
+            print(f"{count:>10} | {timings['sequential']:>10.3f}s | {timings['threads']:>10.3f}s | {speedup:>7.2f}x")
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+
+if __name__ == "__main__":
+    main()
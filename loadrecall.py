@@ -4,8 +4,8 @@ import sys
 from datetime import datetime
 import colorama
 from colorama import Fore, Back, Style
-import psycopg2
-import configparser
+import pgpool
+import loadrepo
 import logging
 from pathlib import Path
 
@@ -32,28 +32,6 @@ logging.basicConfig(
     ]
 )
 
-def load_pg_config():
-    """Load PostgreSQL configuration from sql.ini file."""
-    config = configparser.ConfigParser()
-    config_path = os.path.join(SQL_DIR, "sql.ini")
-    
-    if not os.path.exists(config_path):
-        logging.error(f"PostgreSQL configuration file not found at {config_path}")
-        return None
-        
-    try:
-        config.read(config_path)
-        return {
-            'host': config['SQL']['PG_HOST'],
-            'port': config['SQL']['PG_PORT'],
-            'database': config['SQL']['PG_DATABASE'],
-            'user': config['SQL']['PG_USERNAME'],
-            'password': config['SQL']['PG_PASSWORD']
-        }
-    except Exception as e:
-        logging.error(f"Error loading PostgreSQL configuration: {e}")
-        return None
-
 def get_load_details(load_number):
     """
     Retrieve and format load details for a given load number.
@@ -63,69 +41,11 @@ def get_load_details(load_number):
     
     try:
         # Load database configuration
-        pg_config = load_pg_config()
-        if not pg_config:
+        if not pgpool.load_pg_config():
             raise Exception("Failed to load database configuration")
         
-        # Connect to database
-        conn = psycopg2.connect(**pg_config)
-        cursor = conn.cursor()
-        logging.info("Database connection successful")
-        
-        # Get collections
-        cursor.execute("""
-            SELECT 
-                dwjtype,
-                dwjcust,
-                dwjname,
-                dwjdate,
-                dwjadrcod,
-                dwjpostco
-            FROM public.dwjjob
-            WHERE dwjload = %s
-            AND dwjtype = 'C'
-            ORDER BY dwjdate, dwjcust
-        """, (load_number,))
-        
-        collections = cursor.fetchall()
-        logging.info(f"Found {len(collections)} collections")
-        
-        # Get deliveries
-        cursor.execute("""
-            SELECT 
-                dwjtype,
-                dwjcust,
-                dwjname,
-                dwjdate,
-                dwjadrcod,
-                dwjpostco
-            FROM public.dwjjob
-            WHERE dwjload = %s
-            AND dwjtype = 'D'
-            ORDER BY dwjdate, dwjcust
-        """, (load_number,))
-        
-        deliveries = cursor.fetchall()
-        logging.info(f"Found {len(deliveries)} deliveries")
-        
-        # Get vehicles with their collection and delivery assignments
-        cursor.execute("""
-            SELECT DISTINCT 
-                v.dwvvehref,
-                v.dwvmoddes,
-                v.dwvcolcod,
-                v.dwvdelcod,
-                COALESCE(e.sparekeys, 'Y') as sparekeys,
-                COALESCE(e.extra, 'Y') as extra,
-                COALESCE(e.carnotes, '') as carnotes
-            FROM public.dwvveh v
-            LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
-            WHERE v.dwvload = %s
-            ORDER BY v.dwvvehref
-        """, (load_number,))
-        
-        vehicles = cursor.fetchall()
-        logging.info(f"Found {len(vehicles)} vehicles")
+        # Jobs, vehicles and extra car info all come back in one query
+        load = loadrepo.fetch_load(load_number)
         
         # Format the data into a structured dictionary
         load_data = {
@@ -135,42 +55,32 @@ def get_load_details(load_number):
             'vehicles': []
         }
         
-        # Process collections
-        for collection in collections:
-            load_data['collections'].append({
-                'type': collection[0],
-                'customer': collection[1],
-                'name': collection[2],
-                'date': datetime.strptime(str(collection[3]), '%Y%m%d').strftime('%d/%m/%Y'),
-                'address_code': collection[4],
-                'postcode': collection[5]
-            })
-        
-        # Process deliveries
-        for delivery in deliveries:
-            load_data['deliveries'].append({
-                'type': delivery[0],
-                'customer': delivery[1],
-                'name': delivery[2],
-                'date': datetime.strptime(str(delivery[3]), '%Y%m%d').strftime('%d/%m/%Y'),
-                'address_code': delivery[4],
-                'postcode': delivery[5]
-            })
+        # Process collections and deliveries
+        for job_type, jobs in (('collections', load['collections']), ('deliveries', load['deliveries'])):
+            for job in jobs:
+                load_data[job_type].append({
+                    'type': job['dwjtype'],
+                    'customer': job['dwjcust'],
+                    'name': job['dwjname'],
+                    'date': datetime.strptime(str(job['dwjdate']), '%Y%m%d').strftime('%d/%m/%Y'),
+                    'address_code': job['dwjadrcod'],
+                    'postcode': job['dwjpostco']
+                })
         
         # Process vehicles
-        for vehicle in vehicles:
+        for vehicle in load['vehicles']:
             # Find collection and delivery locations for this vehicle
-            collection = next((c for c in load_data['collections'] if c['address_code'] == vehicle[2]), None)
-            delivery = next((d for d in load_data['deliveries'] if d['address_code'] == vehicle[3]), None)
+            collection = next((c for c in load_data['collections'] if c['address_code'] == vehicle['dwvcolcod']), None)
+            delivery = next((d for d in load_data['deliveries'] if d['address_code'] == vehicle['dwvdelcod']), None)
             
             load_data['vehicles'].append({
-                'registration': vehicle[0],
-                'model': vehicle[1],
+                'registration': vehicle['dwvvehref'],
+                'model': vehicle['dwvmoddes'],
                 'collection': collection['name'] if collection else 'Unknown',
                 'delivery': delivery['name'] if delivery else 'Unknown',
-                'spare_keys': vehicle[4],
-                'documents': vehicle[5],
-                'notes': vehicle[6]
+                'spare_keys': vehicle['sparekeys'],
+                'documents': vehicle['extra'],
+                'notes': vehicle['carnotes']
             })
         
         return load_data
@@ -178,11 +88,6 @@ def get_load_details(load_number):
     except Exception as e:
         logging.error(f"Error retrieving load details: {e}", exc_info=True)
         raise
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
 
 def display_load_details(load_data):
     """Display load details in a clean, formatted way."""
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Load Repository
+
+Fetches everything about a load (collection and delivery jobs, vehicles and
+their extracarinfo) from PostgreSQL in a single round trip, so PAPERWORK.py,
+SQL.py and loadrecall.py don't each run their own collection, delivery and
+vehicle queries. Jobs and vehicles come back as dicts keyed by column name.
+"""
+
+import logging
+import pgpool
+
+# Jobs and vehicles are aggregated to JSON server-side, so a load is one row
+# however many cars it carries. {load} is the load number placeholder or column.
+LOAD_AGGREGATES = """
+        (
+            SELECT COALESCE(json_agg(j ORDER BY j.dwjdate, j.dwjcust) FILTER (WHERE j.dwjtype = 'C'), '[]'::json)
+            FROM (
+                SELECT dwjtype, dwjcust, dwjname, dwjdate, dwjadrcod, dwjpostco, dwjvehs
+                FROM public.dwjjob
+                WHERE dwjload = {load}
+            ) j
+        ) AS collections,
+        (
+            SELECT COALESCE(json_agg(j ORDER BY j.dwjdate, j.dwjcust) FILTER (WHERE j.dwjtype = 'D'), '[]'::json)
+            FROM (
+                SELECT dwjtype, dwjcust, dwjname, dwjdate, dwjadrcod, dwjpostco, dwjvehs
+                FROM public.dwjjob
+                WHERE dwjload = {load}
+            ) j
+        ) AS deliveries,
+        (
+            SELECT COALESCE(json_agg(v ORDER BY v.dwvvehref), '[]'::json)
+            FROM (
+                SELECT DISTINCT
+                    v.dwvvehref,
+                    v.dwvmoddes,
+                    v.dwvcolcod,
+                    v.dwvdelcod,
+                    v.dwvexpdat,
+                    COALESCE(e.sparekeys, 'Y') AS sparekeys,
+                    COALESCE(e.extra, 'Y') AS extra,
+                    COALESCE(e.carnotes, '') AS carnotes
+                FROM public.dwvveh v
+                LEFT JOIN public.extracarinfo e ON v.dwvkey = e.idkey
+                WHERE v.dwvload = {load}
+            ) v
+        ) AS vehicles
+"""
+
+LOAD_QUERY = "SELECT" + LOAD_AGGREGATES.format(load="%(load_number)s")
+
+# Every load with a vehicle due in the week, each aggregated as above
+WEEK_QUERY = """
+    WITH week_loads AS (
+        SELECT DISTINCT dwvload
+        FROM public.dwvveh
+        WHERE dwvexpdat BETWEEN %(start_date)s AND %(end_date)s
+        AND dwvload IS NOT NULL
+    )
+    SELECT
+        l.dwvload,""" + LOAD_AGGREGATES.format(load="l.dwvload") + """
+    FROM week_loads l
+    ORDER BY l.dwvload
+"""
+
+def fetch_load(load_number, cursor=None):
+    """
+    Fetch a whole load in one query.
+    Returns a dict with 'load_number', 'collections', 'deliveries' and 'vehicles'.
+    Pass a cursor to reuse an open connection, otherwise one is taken from the pool.
+    """
+    if cursor is None:
+        with pgpool.connection() as conn:
+            with conn.cursor() as cursor:
+                return fetch_load(load_number, cursor)
+
+    cursor.execute(LOAD_QUERY, {'load_number': load_number})
+    return build_load(load_number, *cursor.fetchone())
+
+def fetch_week(start_date, end_date, cursor=None):
+    """
+    Fetch every load with a vehicle due between two YYYYMMDD dates in one query.
+    Returns a dict of load number to load (as fetch_load), ordered by load number.
+    """
+    if cursor is None:
+        with pgpool.connection() as conn:
+            with conn.cursor() as cursor:
+                return fetch_week(start_date, end_date, cursor)
+
+    cursor.execute(WEEK_QUERY, {'start_date': start_date, 'end_date': end_date})
+    week = {row[0]: build_load(*row) for row in cursor.fetchall()}
+    logging.info(f"Prefetched {len(week)} loads for {start_date} to {end_date}")
+    return week
+
+def build_load(load_number, collections, deliveries, vehicles):
+    """Assemble a load dict from its aggregated row."""
+    logging.debug(f"Load {load_number}: {len(collections)} collections, {len(deliveries)} deliveries, {len(vehicles)} vehicles")
+    return {
+        'load_number': load_number,
+        'collections': collections,
+        'deliveries': deliveries,
+        'vehicles': vehicles
+    }
+
+def get_job_vehicles(load, job):
+    """Vehicles collected from or delivered to a job's address."""
+    code_column = 'dwvcolcod' if job['dwjtype'] == 'C' else 'dwvdelcod'
+    return [v for v in load['vehicles'] if v[code_column] == job['dwjadrcod']]
+
+def format_location(job):
+    """'Name - Postcode' for a job, or just the name if it has no postcode."""
+    if job['dwjname'] and job['dwjpostco']:
+        return f"{job['dwjname']} - {job['dwjpostco']}"
+    return job['dwjname'] or ''
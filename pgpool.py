@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Connection Pool
+
+One process-wide connection pool shared by SQL.py, PAPERWORK.py, loadrecall.py
+and DB.py, so scripts reuse a few connections instead of reconnecting for
+every query. The sql.ini configuration is read lazily on first use.
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+import configparser
+from contextlib import contextmanager
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SQL_DIRS = [
+    os.path.join(SCRIPT_DIR, "SQL"),
+    os.path.join(SCRIPT_DIR, "sql")  # PAPERWORK.py has always looked here
+]
+
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8  # Enough for DB.py's parallel sync workers
+HEALTH_CHECK_AFTER = 30  # Seconds idle before a pooled connection is pinged on checkout
+
+_config = None
+_pool = None
+_pool_pid = None
+_last_used = {}
+_inherited_pools = []
+_lock = threading.Lock()
+
+def load_pg_config():
+    """Load PostgreSQL configuration from sql.ini, once per process."""
+    global _config
+    if _config is not None:
+        return _config
+
+    config_path = next((os.path.join(d, "sql.ini") for d in SQL_DIRS
+                        if os.path.exists(os.path.join(d, "sql.ini"))), None)
+    if not config_path:
+        logging.error(f"PostgreSQL configuration file not found at {os.path.join(SQL_DIRS[0], 'sql.ini')}")
+        return None
+
+    try:
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        _config = {
+            'host': config['SQL']['PG_HOST'],
+            'port': config['SQL']['PG_PORT'],
+            'database': config['SQL']['PG_DATABASE'],
+            'user': config['SQL']['PG_USERNAME'],
+            'password': config['SQL']['PG_PASSWORD']
+        }
+        return _config
+    except Exception as e:
+        logging.error(f"Error loading PostgreSQL configuration: {e}")
+        return None
+
+def get_pool():
+    """Get the process-wide pool, creating it on first use."""
+    global _pool, _pool_pid
+    with _lock:
+        # A forked worker process must not share its parent's sockets
+        if _pool is None or _pool_pid != os.getpid():
+            if _pool is not None:
+                # Keep the parent's pool alive: freeing it here would close its sockets under the parent
+                _inherited_pools.append(_pool)
+            config = load_pg_config()
+            if not config:
+                raise psycopg2.OperationalError("PostgreSQL configuration not found. Please check sql.ini file.")
+            _pool = ThreadedConnectionPool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, **config)
+            _pool_pid = os.getpid()
+            _last_used.clear()
+            logging.info(f"Opened PostgreSQL connection pool to {config['host']}:{config['port']}")
+        return _pool
+
+def get_connection():
+    """Check a working connection out of the pool, replacing any that have gone stale."""
+    pool = get_pool()
+    for _ in range(POOL_MAX_CONNECTIONS + 1):
+        conn = pool.getconn()
+        if conn.closed:
+            pool.putconn(conn, close=True)
+            continue
+
+        # Only ping connections that have sat idle long enough to have been dropped
+        last_used = _last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < HEALTH_CHECK_AFTER:
+            return conn
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return conn
+        except psycopg2.Error:
+            logging.warning("Discarding dead pooled PostgreSQL connection")
+            _last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+
+    raise psycopg2.OperationalError("Could not get a working PostgreSQL connection from the pool")
+
+def release_connection(conn):
+    """Return a connection to the pool; anything left uncommitted is rolled back."""
+    if conn is None:
+        return
+    if _pool is None or _pool_pid != os.getpid():
+        conn.close()
+        return
+    if conn.closed:
+        _last_used.pop(id(conn), None)
+        _pool.putconn(conn, close=True)
+        return
+    _last_used[id(conn)] = time.monotonic()
+    _pool.putconn(conn)
+
+@contextmanager
+def connection():
+    """Context manager around get_connection()/release_connection()."""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+def close_pool():
+    """Close every pooled connection."""
+    global _pool
+    with _lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+
+atexit.register(close_pool)